@@ -0,0 +1,179 @@
+# Program: Beauty Bot API load test
+# Description: Opens many keep-alive connections to the N'Kahoots HTTP API (nkahoots.server) at once and
+#              sends GET requests for the skin type pages and thumbnails over each of them, then prints the
+#              throughput, the latency percentiles and the number of errors as JSON.
+#
+#              Without --url the server is started in a separate process first (pinned to one CPU where the
+#              platform allows it) and stopped afterwards, so the load generator does not share its core.
+#              With --etag every request sends the ETag from an earlier response and expects 304 Not Modified.
+#
+# Usage (from the "Final Folder" directory):
+#   python -m benchmarks.load_test [--connections 1000] [--requests 20] [--gzip] [--etag] [--url http://host:port]
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import socket
+import subprocess
+import sys
+import time
+from urllib.parse import urlsplit
+
+FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FOLDER)
+
+from nkahoots.catalog import get_catalog  # noqa: E402
+from nkahoots.data import skin_data  # noqa: E402
+
+DEFAULT_PORT = 8089
+
+
+def _percentile(values, fraction):
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def request_paths():
+    paths = ["/skin-types"]
+    paths.extend("/skin-types/" + skin_type for skin_type in skin_data)
+    paths.extend(dict.fromkeys("/thumbnails/" + product.image for product in get_catalog().products if product.image))
+    return paths
+
+
+async def read_response(reader):
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    headers = {}
+    for line in lines[1:]:
+        name, _, value = line.partition(":")
+        if name:
+            headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return status, headers, body
+
+
+# Collect the ETag of every path (for --etag) and drop the paths the server does not have
+async def fetch_etags(host, port, paths):
+    reader, writer = await asyncio.open_connection(host, port)
+    etags = {}
+    for path in paths:
+        writer.write("GET {} HTTP/1.1\r\nHost: {}\r\n\r\n".format(path, host).encode("latin-1"))
+        status, headers, _ = await read_response(reader)
+        if status == 200:
+            etags[path] = headers.get("etag")
+    writer.close()
+    return etags
+
+
+async def client(host, port, paths, count, offset, extra_headers, expected, latencies, errors):
+    try:
+        reader, writer = await asyncio.open_connection(host, port)
+    except OSError:
+        errors.append("connect")
+        return
+    try:
+        for number in range(count):
+            path = paths[(offset + number) % len(paths)]
+            request = "GET {} HTTP/1.1\r\nHost: {}\r\n{}\r\n".format(path, host, extra_headers(path))
+            started = time.perf_counter()
+            writer.write(request.encode("latin-1"))
+            status, _, _ = await read_response(reader)
+            latencies.append((time.perf_counter() - started) * 1000)
+            if status != expected:
+                errors.append(status)
+    except (OSError, asyncio.IncompleteReadError) as error:
+        errors.append(type(error).__name__)
+    finally:
+        writer.close()
+
+
+async def run_load(host, port, connections, requests, use_gzip, use_etag):
+    paths = request_paths()
+    etags = await fetch_etags(host, port, paths)
+    paths = [path for path in paths if path in etags]
+
+    def extra_headers(path):
+        headers = ""
+        if use_gzip:
+            headers += "Accept-Encoding: gzip\r\n"
+        if use_etag:
+            headers += "If-None-Match: {}\r\n".format(etags[path])
+        return headers
+
+    latencies = []
+    errors = []
+    started = time.perf_counter()
+    await asyncio.gather(*(client(host, port, paths, requests, number, extra_headers, 304 if use_etag else 200,
+                                  latencies, errors) for number in range(connections)))
+    elapsed = time.perf_counter() - started
+    latencies.sort()
+    return {
+        "connections": connections,
+        "requests": len(latencies),
+        "errors": len(errors),
+        "seconds": round(elapsed, 3),
+        "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+        "latency_ms": {
+            "p50": round(_percentile(latencies, 0.50), 3),
+            "p95": round(_percentile(latencies, 0.95), 3),
+            "p99": round(_percentile(latencies, 0.99), 3),
+            "max": round(latencies[-1], 3),
+        } if latencies else None,
+        "gzip": use_gzip,
+        "etag": use_etag,
+    }
+
+
+def start_server(port):
+    command = [sys.executable, "-m", "nkahoots.server", "--port", str(port)]
+    if sys.platform.startswith("linux") and hasattr(os, "sched_getaffinity"):
+        command = ["taskset", "-c", str(min(os.sched_getaffinity(0)))] + command
+    process = subprocess.Popen(command, cwd=FOLDER, stdout=subprocess.DEVNULL)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError("the server exited with code {}".format(process.returncode))
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.5).close()
+            return process
+        except OSError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("the server did not start within 30 s")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load test the N'Kahoots HTTP API.")
+    parser.add_argument("--url", help="running server to test (default: start one on port {})".format(DEFAULT_PORT))
+    parser.add_argument("--connections", type=int, default=1000, help="concurrent connections (default: %(default)s)")
+    parser.add_argument("--requests", type=int, default=20, help="requests per connection (default: %(default)s)")
+    parser.add_argument("--gzip", action="store_true", help="send Accept-Encoding: gzip")
+    parser.add_argument("--etag", action="store_true", help="send If-None-Match and expect 304 responses")
+    args = parser.parse_args(argv)
+
+    process = None
+    if args.url:
+        url = urlsplit(args.url)
+        host, port = url.hostname, url.port or 80
+    else:
+        host, port = "127.0.0.1", DEFAULT_PORT
+        try:
+            process = start_server(port)
+        except (OSError, RuntimeError) as error:
+            print("Could not start the server: {}".format(error), file=sys.stderr)
+            return 1
+    try:
+        result = asyncio.run(run_load(host, port, args.connections, args.requests, args.gzip, args.etag))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+    print(json.dumps(result, indent=2))
+    return 1 if result["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,386 @@
+# Program: Beauty Bot benchmarks
+# Description: Times the hot paths of the N'Kahoots Beauty Bot and writes the results as JSON:
+#              - open_product_window end to end (cold thumbnail cache, warm cache, reused window and
+#                thumbnails from the prebuilt atlas), until every product image has been handed to its row
+#              - decoding and resizing every JPEG in images/ to 150x150
+#              - get_product_description lookups
+#              - setting a reminder N times through set_reminder_handler (one reminder per skin type, so
+#                later calls move it), and adding N reminders to the scheduler and firing them
+#              - appending M rows to the usage log and reading them back with the usage report
+#
+#              With a display (a real one or Xvfb, e.g. "xvfb-run python -m benchmarks.run_benchmarks") the
+#              product window is built with real Tk widgets. Without one, tkinter, the message boxes and the
+#              PhotoImage conversion are replaced by mocks so the suite still runs on a headless machine; the
+#              mode used is recorded in the output.
+#
+# Usage (from the "Final Folder" directory):
+#   python -m benchmarks.run_benchmarks [-o results.json] [--compare baseline.json] [--threshold 0.2]
+
+import argparse
+from contextlib import ExitStack, redirect_stdout
+from datetime import datetime, timedelta
+import io
+import itertools
+import json
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from unittest import mock
+
+FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(FOLDER, "images")
+DEFAULT_THRESHOLD = 0.2  # a benchmark counts as slower when its median grows by more than 20%
+
+
+# Run fn `repeat` times and return timing statistics in milliseconds. setup() runs before each call and
+# is not timed.
+def measure(fn, repeat, setup=None, items=1):
+    durations = []
+    for _ in range(repeat):
+        if setup is not None:
+            setup()
+        started = time.perf_counter()
+        fn()
+        durations.append((time.perf_counter() - started) * 1000)
+    return {
+        "repeat": repeat,
+        "items": items,
+        "min_ms": round(min(durations), 4),
+        "median_ms": round(statistics.median(durations), 4),
+        "mean_ms": round(statistics.fmean(durations), 4),
+        "max_ms": round(max(durations), 4),
+    }
+
+
+def has_display():
+    if not os.environ.get("DISPLAY") and sys.platform.startswith("linux"):
+        return False
+    try:
+        import tkinter
+        tkinter.Tk().destroy()
+        return True
+    except Exception:
+        return False
+
+
+# Stand-in for the Tk root when running without a display: after() callbacks are run by pump()
+class HeadlessRoot:
+    def __init__(self):
+        self._callbacks = []
+
+    def after(self, delay_ms, callback):
+        self._callbacks.append(callback)
+        return str(len(self._callbacks))
+
+    def after_cancel(self, after_id):
+        pass
+
+    def pump(self):
+        callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+
+# Stand-in for VirtualList without a display: fills the rows that would be visible
+class HeadlessVirtualList:
+    def __init__(self, parent, row_height, create_row, fill_row, visible_rows=3, **kwargs):
+        self.create_row = create_row
+        self.fill_row = fill_row
+        self.visible_rows = visible_rows
+
+    def pack(self, **kwargs):
+        pass
+
+    def set_items(self, items):
+        for item in list(items)[:self.visible_rows + 1]:
+            self.fill_row(self.create_row(mock.MagicMock()), item)
+
+
+def bench_product_window(gui, root, pump, repeat, stack):
+    from nkahoots import assets
+    from nkahoots.image_loader import ImageLoader
+    from nkahoots.thumbnails import ThumbnailCache
+
+    skin_types = list(gui.skin_data)
+    cache_dir = stack.enter_context(tempfile.TemporaryDirectory())
+    state = {}
+
+    def wait_for_images():
+        loader = gui.image_loader
+        while True:
+            pump()
+            if not loader._outstanding and loader._results.empty():
+                pump()
+                return
+            time.sleep(0.0005)
+
+    def close_windows():
+        for window in list(gui.product_windows.values()):
+            try:
+                window.destroy()
+            except Exception:
+                pass
+        gui.product_windows.clear()
+        gui.photo_cache.clear()
+
+    def cold_setup():
+        close_windows()
+        if gui.image_loader is not None:
+            gui.image_loader.shutdown()
+        # Fresh caches in a fresh directory: every image is decoded and resized again
+        state["cache"] = ThumbnailCache(cache_dir=tempfile.mkdtemp(dir=cache_dir))
+        gui.image_loader = ImageLoader(root, cache=state["cache"])
+
+    def warm_setup():
+        close_windows()
+
+    def open_all():
+        for skin_type in skin_types:
+            gui.open_product_window(skin_type)
+        wait_for_images()
+
+    # The PIL path first, with any prebuilt atlas out of the way
+    stack.enter_context(mock.patch.object(gui, "get_atlas", lambda: None))
+    results = {
+        "product_window_cold_cache": measure(open_all, repeat, setup=cold_setup, items=len(skin_types)),
+        "product_window_warm_cache": measure(open_all, repeat, setup=warm_setup, items=len(skin_types)),
+        "product_window_reused": measure(open_all, repeat, items=len(skin_types)),
+    }
+
+    # Then with thumbnails from a freshly built atlas (no JPEG decoding at runtime)
+    asset_dir = stack.enter_context(tempfile.TemporaryDirectory())
+    assets.build(IMAGE_DIR, asset_dir)
+    atlas = assets.ThumbnailAtlas.open(asset_dir)
+    stack.callback(atlas.close)
+    stack.enter_context(mock.patch.object(gui, "get_atlas", lambda: atlas))
+    results["product_window_atlas"] = measure(open_all, repeat, setup=warm_setup, items=len(skin_types))
+    results["atlas_build_up_to_date"] = measure(lambda: assets.build(IMAGE_DIR, asset_dir), repeat)
+    close_windows()
+    gui.image_loader.shutdown()
+    return results
+
+
+def bench_image_decode(repeat):
+    from PIL import Image
+
+    paths = [os.path.join(IMAGE_DIR, name) for name in sorted(os.listdir(IMAGE_DIR)) if name.endswith(".jpg")]
+
+    def decode_all():
+        for path in paths:
+            with Image.open(path) as image:
+                image.resize((150, 150))
+
+    return {"image_decode_resize": measure(decode_all, repeat, items=len(paths))}
+
+
+def bench_descriptions(gui, repeat, lookups):
+    from nkahoots.catalog import get_catalog
+    from nkahoots.data import get_product_description
+
+    catalog = get_catalog()
+    keys = [(skin_type, index) for skin_type in gui.skin_data
+            for index in range(1, len(catalog.by_skin_type(skin_type)) + 1)]
+    rng = random.Random(1)
+    sample = [rng.choice(keys) for _ in range(lookups)]
+
+    def look_up():
+        for skin_type, index in sample:
+            get_product_description(skin_type, index)
+
+    return {"get_product_description": measure(look_up, repeat, items=lookups)}
+
+
+# A stand-in for the Entry and StringVar widgets read by set_reminder_handler
+class Value:
+    def __init__(self, value):
+        self.value = value
+
+    def get(self):
+        return self.value
+
+    # The handler clears its entries after a reminder is set; the benchmark reuses them for every call
+    def delete(self, first, last):
+        pass
+
+
+def bench_reminders(gui, repeat, count, stack):
+    from nkahoots.reminders import ReminderScheduler
+
+    store_dir = stack.enter_context(tempfile.TemporaryDirectory())
+    skin_types = list(gui.skin_data)
+    tomorrow = datetime.now() + timedelta(days=1)
+    date_entry = Value(tomorrow.strftime("%m-%d"))
+    rng = random.Random(2)
+    entries = []
+    for _ in range(count):
+        moment = datetime(2000, 1, 1, rng.randrange(1, 13), rng.randrange(60))
+        entries.append((rng.choice(skin_types), Value(moment.strftime("%I:%M")), Value(rng.choice(["AM", "PM"]))))
+
+    def setup():
+        gui.reminder_scheduler = ReminderScheduler(None, lambda reminder: gui.display_reminder(reminder.skin_type),
+                                                   store_path=os.path.join(store_dir, "reminders.json"))
+
+    def schedule():
+        for skin_type, time_entry, am_var in entries:
+            gui.set_reminder_handler(skin_type, date_entry, time_entry, am_var)
+        expected = len({skin_type for skin_type, _, _ in entries})
+        assert len(gui.reminder_scheduler) == expected, "expected {} reminders, got {}".format(
+            expected, len(gui.reminder_scheduler))
+
+    # The heap itself at scale: N reminders added straight to the scheduler, then all fired
+    due_times = [tomorrow.replace(hour=rng.randrange(24), minute=rng.randrange(60), second=0, microsecond=0)
+                 for _ in range(count)]
+
+    def add_and_fire():
+        for skin_type, due in zip(itertools.cycle(skin_types), due_times):
+            gui.reminder_scheduler.add(skin_type, due)
+        fired = gui.reminder_scheduler.fire_due(tomorrow.replace(hour=23, minute=59, second=59))
+        assert len(fired) == count, "expected {} reminders to fire, got {}".format(count, len(fired))
+
+    return {
+        "reminders_schedule": measure(schedule, repeat, setup=setup, items=count),
+        "reminders_add_and_fire": measure(add_and_fire, repeat, setup=setup, items=count),
+    }
+
+
+def bench_usage_log(repeat, rows, stack):
+    from nkahoots import usage_report
+    from nkahoots.event_log import EventLog
+
+    log_dir = stack.enter_context(tempfile.TemporaryDirectory())
+    log_path = os.path.join(log_dir, "application_dates.csv")
+    checkpoint_path = os.path.join(log_dir, "checkpoint.json")
+
+    def reset_log():
+        for name in os.listdir(log_dir):
+            os.remove(os.path.join(log_dir, name))
+
+    def append_rows():
+        event_log = EventLog(log_path, flush_policy="exit")
+        for index in range(rows):
+            event_log.log("launch" if index % 4 == 0 else "skin_type_viewed", None if index % 4 == 0 else "Dry")
+        event_log.close()
+
+    def read_rows():
+        stats = usage_report.update(log_path, checkpoint_path, reset=True)
+        assert stats.launches == (rows + 3) // 4
+
+    def read_incremental():
+        usage_report.update(log_path, checkpoint_path)
+
+    results = {"usage_log_append": measure(append_rows, repeat, setup=reset_log, items=rows)}
+    reset_log()
+    append_rows()
+    results["usage_log_read_full"] = measure(read_rows, repeat, items=rows)
+    results["usage_log_read_incremental"] = measure(read_incremental, repeat, items=0)
+    return results
+
+
+def run(args):
+    sys.path.insert(0, FOLDER)
+    from nkahoots import gui
+    from nkahoots.event_log import EventLog
+
+    results = {}
+    display = not args.mock_tk and has_display()
+    with ExitStack() as stack:
+        stack.enter_context(redirect_stdout(io.StringIO()))
+        log_dir = stack.enter_context(tempfile.TemporaryDirectory())
+        # Keep benchmark events out of the real usage log
+        stack.enter_context(mock.patch.object(gui, "event_log", EventLog(os.path.join(log_dir, "events.csv"))))
+        stack.enter_context(mock.patch.object(gui, "messagebox"))
+
+        if display:
+            import tkinter
+            root = tkinter.Tk()
+            root.withdraw()
+            stack.callback(root.destroy)
+            pump = root.update
+        else:
+            root = HeadlessRoot()
+            pump = root.pump
+            stack.enter_context(mock.patch.object(gui, "tk"))
+            stack.enter_context(mock.patch.object(gui, "VirtualList", HeadlessVirtualList))
+            stack.enter_context(mock.patch("PIL.ImageTk.PhotoImage", side_effect=lambda image: image.tobytes()))
+        stack.enter_context(mock.patch.object(gui, "root", root))
+        stack.enter_context(mock.patch.object(gui, "image_loader", None))
+        stack.enter_context(mock.patch.object(gui, "reminder_scheduler", None))
+
+        results.update(bench_product_window(gui, root, pump, args.repeat, stack))
+        results.update(bench_image_decode(args.repeat))
+        results.update(bench_descriptions(gui, args.repeat, args.lookups))
+        results.update(bench_reminders(gui, args.repeat, args.reminders, stack))
+        results.update(bench_usage_log(args.repeat, args.rows, stack))
+
+    return {
+        "meta": {
+            "created": datetime.now().isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "tk": "display" if display else "mocked",
+            "repeat": args.repeat,
+        },
+        "results": results,
+    }
+
+
+# Compare medians with a baseline; returns the names of the benchmarks that got slower than allowed
+def compare(report, baseline, threshold):
+    regressions = []
+    print("{:<30} {:>12} {:>12} {:>8}".format("benchmark", "baseline ms", "current ms", "change"))
+    for name, current in sorted(report["results"].items()):
+        previous = baseline.get("results", {}).get(name)
+        if previous is None:
+            print("{:<30} {:>12} {:>12.3f} {:>8}".format(name, "-", current["median_ms"], "new"))
+            continue
+        # Compare the time per item so runs with a different --rows/--reminders/--lookups stay comparable
+        before = previous["median_ms"] / max(previous.get("items", 1), 1)
+        after = current["median_ms"] / max(current["items"], 1)
+        change = (after - before) / before if before else 0.0
+        flag = " SLOWER" if change > threshold else ""
+        print("{:<30} {:>12.3f} {:>12.3f} {:>+7.1%}{}".format(name, previous["median_ms"], current["median_ms"], change, flag))
+        if change > threshold:
+            regressions.append(name)
+    if baseline.get("meta", {}).get("tk") != report["meta"]["tk"]:
+        print("Note: the baseline was recorded with Tk {}, this run used Tk {}".format(
+            baseline.get("meta", {}).get("tk"), report["meta"]["tk"]))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the N'Kahoots Beauty Bot hot paths.")
+    parser.add_argument("-o", "--output", help="write the results to this JSON file (default: standard output)")
+    parser.add_argument("--compare", metavar="BASELINE", help="compare with a results file from an earlier run")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed slowdown of the median before a benchmark fails (default: %(default)s)")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per benchmark (default: %(default)s)")
+    parser.add_argument("--lookups", type=int, default=10000, help="description lookups per run")
+    parser.add_argument("--reminders", type=int, default=1000, help="reminders scheduled per run")
+    parser.add_argument("--rows", type=int, default=100000, help="usage log rows written per run")
+    parser.add_argument("--mock-tk", action="store_true", help="mock Tk even when a display is available")
+    args = parser.parse_args(argv)
+
+    report = run(args)
+    text = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(text + "\n")
+    elif not args.compare:
+        print(text)
+
+    if args.compare:
+        with open(args.compare) as file:
+            baseline = json.load(file)
+        regressions = compare(report, baseline, args.threshold)
+        if regressions:
+            print("Slower than the baseline: " + ", ".join(regressions))
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,29 @@
+# Package: nkahoots
+# Description: Support modules for the N'Kahoots Beauty Bot. Importing the package has no side effects and
+#              loads nothing heavy: skin_data, best_times, get_product_description and main are looked up
+#              from their modules the first time they are used, and tkinter and PIL are only imported once
+#              a window needs them.
+#
+# Usage: python -m nkahoots   (or run "Nkahoots Reminder.py")
+
+import importlib
+
+# Public name -> module that defines it
+_LAZY_ATTRIBUTES = {
+    "skin_data": "nkahoots.data",
+    "best_times": "nkahoots.data",
+    "button_data": "nkahoots.data",
+    "get_product_description": "nkahoots.data",
+    "main": "nkahoots.gui",
+}
+
+__all__ = sorted(_LAZY_ATTRIBUTES)
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError("module 'nkahoots' has no attribute {!r}".format(name))
+    value = getattr(importlib.import_module(module_name), name)
+    globals()[name] = value
+    return value
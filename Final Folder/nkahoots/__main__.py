@@ -0,0 +1,7 @@
+import time
+
+started = time.perf_counter()
+
+from nkahoots.gui import main  # noqa: E402  (imported after the start time is taken)
+
+main(started)
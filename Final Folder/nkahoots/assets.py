@@ -0,0 +1,205 @@
+# Module: assets
+# Description: Offline build of the product thumbnails and the runtime reader for the result.
+#
+#              "python -m nkahoots.assets" resizes every product image named in the catalog
+#              to THUMBNAIL_SIZE, encodes it in a format Tk reads by itself (PNG, or PPM with --format ppm)
+#              and packs all thumbnails into one atlas file named after the hash of its contents, next to an
+#              index (thumbnails.json) with the offset and length of every thumbnail. A thumbnail is only
+#              re-encoded when its source image changed (size or modification time); when nothing changed
+#              the atlas is left alone. PIL is needed for the build only.
+#
+#              At runtime ThumbnailAtlas memory-maps the atlas and hands out the encoded bytes, so the GUI
+#              can create its PhotoImages without decoding a JPEG or importing PIL.
+#
+# Usage: python -m nkahoots.assets [--format png|ppm] [--force]
+
+import argparse
+import base64
+import hashlib
+import io
+import json
+import mmap
+import os
+
+# Constants
+FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(FOLDER, "images")
+ASSET_DIR = os.path.join(FOLDER, "assets")
+INDEX_NAME = "thumbnails.json"
+THUMBNAIL_SIZE = (150, 150)
+FORMATS = ("png", "ppm")
+
+
+# Image file names used by the program, in the order they are shown
+def source_images():
+    from nkahoots.catalog import get_catalog
+
+    return list(dict.fromkeys(product.image for product in get_catalog().products if product.image))
+
+
+def _read_index(asset_dir):
+    try:
+        with open(os.path.join(asset_dir, INDEX_NAME)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def _encode(image_path, size, image_format):
+    from PIL import Image
+
+    with Image.open(image_path) as image:
+        thumbnail = image.convert("RGB").resize(size)
+    output = io.BytesIO()
+    thumbnail.save(output, format=image_format.upper())
+    return output.getvalue()
+
+
+# Build (or bring up to date) the thumbnail atlas. Returns the number of thumbnails that were encoded.
+def build(image_dir=IMAGE_DIR, asset_dir=ASSET_DIR, size=THUMBNAIL_SIZE, image_format="png", force=False):
+    if image_format not in FORMATS:
+        raise ValueError("image_format must be one of {}".format(", ".join(FORMATS)))
+    os.makedirs(asset_dir, exist_ok=True)
+
+    previous = None if force else _read_index(asset_dir)
+    if previous is not None and (previous.get("size") != list(size) or previous.get("format") != image_format):
+        previous = None
+    old_atlas = None
+    if previous is not None:
+        try:
+            with open(os.path.join(asset_dir, previous["atlas"]), "rb") as file:
+                old_atlas = file.read()
+        except OSError:
+            previous = None
+
+    entries = {}
+    blobs = []
+    offset = 0
+    encoded = 0
+    changed = previous is None
+    for name in source_images():
+        source_path = os.path.join(image_dir, name)
+        try:
+            info = os.stat(source_path)
+        except FileNotFoundError:
+            print(f"Image not found: {source_path}")
+            continue
+        source = {"mtime_ns": info.st_mtime_ns, "bytes": info.st_size}
+        old_entry = previous["entries"].get(name) if previous is not None else None
+        if old_entry is not None and old_entry["source"] == source:
+            blob = old_atlas[old_entry["offset"]:old_entry["offset"] + old_entry["length"]]
+        else:
+            try:
+                blob = _encode(source_path, size, image_format)
+            except (OSError, ValueError) as error:
+                # An unreadable image is left out of the atlas just like a missing one
+                print(f"Could not read image {source_path}: {error}")
+                continue
+            encoded += 1
+            changed = True
+        entries[name] = {"offset": offset, "length": len(blob), "source": source}
+        blobs.append(blob)
+        offset += len(blob)
+    if previous is not None and set(previous["entries"]) != set(entries):
+        changed = True
+    if not changed:
+        return 0
+
+    content = b"".join(blobs)
+    atlas_name = "thumbnails-{}.atlas".format(hashlib.sha256(content).hexdigest()[:16])
+    atlas_path = os.path.join(asset_dir, atlas_name)
+    # The name is the hash of the content, so an existing file already holds these bytes. It may be
+    # memory-mapped by a running GUI or server, so it is never rewritten in place.
+    if not os.path.exists(atlas_path):
+        temp_path = atlas_path + ".tmp"
+        with open(temp_path, "wb") as file:
+            file.write(content)
+        os.replace(temp_path, atlas_path)
+    index = {"atlas": atlas_name, "format": image_format, "size": list(size), "entries": entries}
+    temp_path = os.path.join(asset_dir, INDEX_NAME + ".tmp")
+    with open(temp_path, "w") as file:
+        json.dump(index, file, indent=1)
+    os.replace(temp_path, os.path.join(asset_dir, INDEX_NAME))
+
+    # Remove atlases from earlier builds
+    for file_name in os.listdir(asset_dir):
+        if file_name.startswith("thumbnails-") and file_name.endswith(".atlas") and file_name != atlas_name:
+            try:
+                os.remove(os.path.join(asset_dir, file_name))
+            except OSError:
+                # Still open in a running GUI or server (Windows); it is removed by a later build
+                pass
+    return encoded
+
+
+class ThumbnailAtlas:
+    def __init__(self, index, atlas_file):
+        self.size = tuple(index["size"])
+        self.format = index["format"]
+        self._entries = index["entries"]
+        self._file = atlas_file
+        self._map = mmap.mmap(atlas_file.fileno(), 0, access=mmap.ACCESS_READ) if os.fstat(atlas_file.fileno()).st_size else None
+
+    # Open the atlas in asset_dir; returns None when it has not been built
+    @classmethod
+    def open(cls, asset_dir=ASSET_DIR):
+        index = _read_index(asset_dir)
+        if index is None:
+            return None
+        try:
+            atlas_file = open(os.path.join(asset_dir, index["atlas"]), "rb")
+        except (OSError, KeyError):
+            return None
+        return cls(index, atlas_file)
+
+    def __contains__(self, name):
+        return name in self._entries
+
+    # The encoded thumbnail for an image file name, or None if it is not in the atlas
+    def get_bytes(self, name):
+        entry = self._entries.get(name)
+        if entry is None or self._map is None:
+            return None
+        return self._map[entry["offset"]:entry["offset"] + entry["length"]]
+
+    # The thumbnail in the form tk.PhotoImage(data=...) accepts for every format
+    def photo_data(self, name):
+        data = self.get_bytes(name)
+        return None if data is None else base64.b64encode(data)
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+        self._file.close()
+
+
+_atlas = None
+_atlas_checked = False
+
+
+# The shared atlas, opened on first use; None when it has not been built
+def get_atlas():
+    global _atlas, _atlas_checked
+    if not _atlas_checked:
+        _atlas_checked = True
+        _atlas = ThumbnailAtlas.open()
+    return _atlas
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Build the product thumbnail atlas used by the GUI.")
+    parser.add_argument("--format", choices=FORMATS, default="png", help="thumbnail format (default: %(default)s)")
+    parser.add_argument("--images", default=IMAGE_DIR, help="source image folder (default: %(default)s)")
+    parser.add_argument("--output", default=ASSET_DIR, help="output folder (default: %(default)s)")
+    parser.add_argument("--force", action="store_true", help="re-encode every thumbnail")
+    args = parser.parse_args(argv)
+
+    encoded = build(args.images, args.output, image_format=args.format, force=args.force)
+    index = _read_index(args.output)
+    if index is not None:
+        print(f"Thumbnail atlas {os.path.join(args.output, index['atlas'])}: "
+              f"{len(index['entries'])} thumbnail(s), {encoded} re-encoded")
+
+
+if __name__ == "__main__":
+    main()
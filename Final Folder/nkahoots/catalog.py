@@ -0,0 +1,173 @@
+# Module: catalog
+# Description: Product catalog for the Beauty Bot, loaded once from catalog.json. Each product is a small
+#              __slots__ record and the catalog keeps indexes by skin type, product name and ingredient,
+#              plus an inverted index (word -> product ids) for full-text search over names and
+#              descriptions. Posting lists are stored as compact arrays of product ids and repeated strings
+#              (skin types, ingredients) are interned, so large catalogs stay cheap in memory.
+#
+# Usage: python -m nkahoots.catalog [--skin-type TYPE] [--ingredient NAME] [words ...]
+
+import argparse
+from array import array
+import json
+import os
+import re
+import sys
+
+# Constants
+CATALOG_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "catalog.json")
+WORD_PATTERN = re.compile(r"[a-z0-9]+(?:['+%-][a-z0-9]+)*")
+STOP_WORDS = frozenset(["a", "an", "and", "are", "as", "at", "be", "both", "by", "for", "from", "in", "is", "it",
+                        "its", "of", "on", "or", "that", "the", "to", "which", "while", "with", "without"])
+
+
+class Product:
+    __slots__ = ("product_id", "skin_type", "name", "image", "ingredients", "description")
+
+    def __init__(self, product_id, skin_type, name, image, ingredients, description):
+        self.product_id = product_id
+        self.skin_type = skin_type
+        self.name = name
+        self.image = image
+        self.ingredients = ingredients  # tuple of lower-case ingredient names
+        self.description = description
+
+    # The description in the "Name: text" form shown in the product window
+    def full_description(self):
+        return "{}: {}".format(self.name, self.description)
+
+    def __repr__(self):
+        return "Product({!r}, {!r})".format(self.skin_type, self.name)
+
+
+# Split text into lower-case search words
+def tokenize(text):
+    return [word for word in WORD_PATTERN.findall(text.lower()) if word not in STOP_WORDS]
+
+
+class Catalog:
+    def __init__(self, products):
+        self.products = []
+        self._by_skin_type = {}
+        self._by_name = {}
+        self._by_ingredient = {}
+        self._word_index = {}
+        for product in products:
+            self._add(product)
+        # Freeze the posting lists into compact arrays once everything is indexed
+        self._by_ingredient = {ingredient: array("I", ids) for ingredient, ids in self._by_ingredient.items()}
+        self._word_index = {word: array("I", ids) for word, ids in self._word_index.items()}
+
+    @classmethod
+    def load(cls, path=CATALOG_PATH):
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        products = []
+        for product_id, item in enumerate(data["products"]):
+            products.append(Product(
+                product_id,
+                sys.intern(item["skin_type"]),
+                item["name"],
+                item.get("image"),
+                tuple(sys.intern(ingredient.lower()) for ingredient in item.get("ingredients", ())),
+                item.get("description", ""),
+            ))
+        return cls(products)
+
+    def _add(self, product):
+        self.products.append(product)
+        self._by_skin_type.setdefault(product.skin_type, []).append(product)
+        # The same product name may be listed under several skin types
+        self._by_name.setdefault(product.name.lower(), []).append(product)
+        for ingredient in product.ingredients:
+            self._by_ingredient.setdefault(ingredient, []).append(product.product_id)
+        for word in set(tokenize(product.name + " " + product.description)):
+            self._word_index.setdefault(sys.intern(word), []).append(product.product_id)
+
+    def __len__(self):
+        return len(self.products)
+
+    def skin_types(self):
+        return list(self._by_skin_type)
+
+    # Products for a skin type in catalog order (the order they are shown in the product window)
+    def by_skin_type(self, skin_type):
+        return self._by_skin_type.get(skin_type, [])
+
+    # The product with this name (for the given skin type, or the first one in catalog order); None if there is none
+    def by_name(self, name, skin_type=None):
+        for product in self._by_name.get(name.lower(), ()):
+            if skin_type is None or product.skin_type == skin_type:
+                return product
+        return None
+
+    def by_ingredient(self, ingredient):
+        return [self.products[product_id] for product_id in self._by_ingredient.get(ingredient.lower(), ())]
+
+    def ingredients(self):
+        return sorted(self._by_ingredient)
+
+    # Products whose name or description contains every word of the query, optionally narrowed down to a
+    # skin type and/or an ingredient. Results are in catalog order. A query made only of stop words matches
+    # nothing; an empty query only applies the filters.
+    def search(self, query="", skin_type=None, ingredient=None, limit=None):
+        words = set(tokenize(query))
+        if query.strip() and not words:
+            return []
+        postings = []
+        for word in words:
+            ids = self._word_index.get(word)
+            if ids is None:
+                return []
+            postings.append(ids)
+        if ingredient is not None:
+            ids = self._by_ingredient.get(ingredient.lower())
+            if ids is None:
+                return []
+            postings.append(ids)
+
+        if postings:
+            # Start from the shortest posting list so the intersection stays small
+            postings.sort(key=len)
+            matches = set(postings[0])
+            for ids in postings[1:]:
+                matches.intersection_update(ids)
+                if not matches:
+                    return []
+            results = [self.products[product_id] for product_id in sorted(matches)]
+            if skin_type is not None:
+                results = [product for product in results if product.skin_type == skin_type]
+        elif skin_type is not None:
+            results = list(self.by_skin_type(skin_type))
+        else:
+            results = list(self.products)
+        return results[:limit] if limit is not None else results
+
+
+_catalog = None
+
+
+# The shared catalog, loaded from catalog.json on first use
+def get_catalog():
+    global _catalog
+    if _catalog is None:
+        _catalog = Catalog.load()
+    return _catalog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Search the N'Kahoots product catalog.")
+    parser.add_argument("words", nargs="*", help="words that must appear in the name or description")
+    parser.add_argument("--skin-type", help="only show products for this skin type")
+    parser.add_argument("--ingredient", help="only show products containing this ingredient")
+    parser.add_argument("--catalog", default=CATALOG_PATH, help="catalog file (default: %(default)s)")
+    args = parser.parse_args(argv)
+
+    catalog = Catalog.load(args.catalog)
+    for product in catalog.search(" ".join(args.words), skin_type=args.skin_type, ingredient=args.ingredient):
+        ingredients = ", ".join(product.ingredients) or "-"
+        print("{:<12} {}  [{}]".format(product.skin_type, product.name, ingredients))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,105 @@
+# Module: data
+# Description: Skin type data for the N'Kahoots Beauty Bot: the descriptions, skincare schedules and tips for
+#              each skin type (skin_data), the best times to wash the face (best_times) and
+#              get_product_description(). The recommended products, their images and descriptions live
+#              only in the product catalog (catalog.json). Nothing here needs tkinter or PIL, so it can be
+#              imported and reused without starting the GUI.
+
+# Updated skin_data with detailed skincare schedules and tips for each skin type
+skin_data = {
+    "Dry": {
+        # Description of dry skin
+        "description": "Dry skin often feels tight and rough, lacking proper moisture and natural oils. It may appear dull, flaky, or even itchy. Proper hydration, gentle cleansers, \nand nourishing moisturizers are essential to restore its natural balance and achieve a healthy, radiant complexion.",
+        # Daily skincare routine for dry skin
+        "schedule": "Morning Routine for Dry Skin:\n"
+                    "1. Cleanse your face with a mild, hydrating cleanser.\n"
+                    "2. Apply a nourishing moisturizer with hyaluronic acid.\n"
+                    "3. Use a sunscreen with SPF 30 or higher.\n\n"
+                    "Evening Routine for Dry Skin:\n"
+                    "1. Double cleanse with an oil-based cleanser followed by a creamy cleanser.\n"
+                    "2. Apply a hydrating toner to balance the skin's pH.\n"
+                    "3. Use a serum with ingredients like vitamin E and C to combat dryness.\n"
+                    "4. Apply a thicker moisturizer to lock in hydration.\n"
+                    "5. Optional: Use a facial oil for added nourishment.\n",
+        # Tips for dry skin
+        "tips": "Tips for Dry Skin:\n"
+                "1. Drink plenty of water to keep your skin hydrated.\n"
+                "2. Avoid using harsh, alcohol-based products that can dry out your skin.\n"
+                "3. Consider adding a weekly hydrating mask to your routine.\n"
+    },
+    "Oily": { # Data for other skin types follows in a similar structure
+        "description": "Oily skin tends to produce excess sebum, resulting in a shiny, greasy appearance. It is more prone to acne and clogged pores. Using oil-free, \n non-comedogenic products and maintaining a consistent skincare routine can help balance and control oil production.",
+        "schedule": "Morning Routine for Oily Skin:\n"
+                    "1. Cleanse your face with a gel-based or foaming cleanser.\n"
+                    "2. Use a lightweight, oil-free moisturizer.\n"
+                    "3. Apply a sunscreen with SPF 30 or higher.\n\n"
+                    "Evening Routine for Oily Skin:\n"
+                    "1. Double cleanse with a gentle cleanser to remove makeup and oil.\n"
+                    "2. Use a toner with ingredients like witch hazel to control excess oil.\n"
+                    "3. Apply a light gel-based moisturizer.\n"
+                    "4. Use a spot treatment for acne-prone areas.\n"
+                    "5. Optional: Use an oil-absorbing sheet during the day.\n",
+        "tips": "Tips for Oily Skin:\n"
+                "1. Avoid heavy, pore-clogging products.\n"
+                "2. Use oil-absorbing sheets during the day to control shine.\n"
+                "3. Don't over-wash your face as it can lead to more oil production.\n"
+    },
+    "Combination": {
+        "description": "Combination skin is characterized by having both oily and dry areas on the face. The T-zone (forehead, nose, and chin) tends to be oilier, while the cheeks are drier.\n A balanced skincare routine is crucial, using products suitable for both skin types to maintain a healthy complexion.",
+        "schedule": "Morning Routine for Combination Skin:\n"
+                    "1. Cleanse your face with a gentle cleanser.\n"
+                    "2. Apply a lightweight moisturizer on the dry areas.\n"
+                    "3. Use an oil-free moisturizer on the oily areas.\n"
+                    "4. Apply a sunscreen with SPF 30 or higher.\n\n"
+                    "Evening Routine for Combination Skin:\n"
+                    "1. Double cleanse with a cleanser suitable for both dry and oily areas.\n"
+                    "2. Use a toner to balance the skin's pH.\n"
+                    "3. Apply a lightweight moisturizer on the dry areas.\n"
+                    "4. Use an oil-free moisturizer on the oily areas.\n"
+                    "5. Optional: Use a spot treatment for acne-prone areas.\n",
+        "tips": "Tips for Combination Skin:\n"
+                "1. Pay attention to the different needs of your T-zone and cheeks.\n"
+                "2. Consider using a weekly exfoliating treatment to prevent clogged pores.\n"
+                "3. Use oil-absorbing sheets on the T-zone during the day.\n"
+    },
+    "Sensitive": {
+        "description": "Sensitive skin is easily irritated and reactive to various factors, such as environmental triggers, fragrances, or certain skincare ingredients.\n It requires gentle and hypoallergenic products that soothe and protect the skin's barrier.",
+        "schedule": "Morning Routine for Sensitive Skin:\n"
+                    "1. Cleanse your face with a mild, fragrance-free cleanser.\n"
+                    "2. Apply a lightweight, hypoallergenic moisturizer.\n"
+                    "3. Use a sunscreen with SPF 30 or higher.\n\n"
+                    "Evening Routine for Sensitive Skin:\n"
+                    "1. Double cleanse with a gentle cleanser to remove makeup and impurities.\n"
+                    "2. Use a calming toner with ingredients like chamomile or aloe vera.\n"
+                    "3. Apply a soothing serum with hyaluronic acid.\n"
+                    "4. Use a fragrance-free moisturizer.\n"
+                    "5. Optional: Apply a nourishing facial oil for added hydration.\n",
+        "tips": "Tips for Sensitive Skin:\n"
+                "1. Avoid products with harsh chemicals and fragrances.\n"
+                "2. Perform patch tests when trying new products.\n"
+                "3. Keep your skincare routine simple and avoid over-exfoliating.\n"
+    }
+}
+
+
+# Dictionary containing best times to wash face based on skin type
+best_times = {
+    "Dry": "Best time to wash your face is once a day, preferably in the evening.",
+    "Oily": "Best time to wash your face is twice a day, once in the morning and once before bed.",
+    "Combination": "Best time to wash your face is twice a day, once in the morning and once before bed.",
+    "Sensitive": "Best time to wash your face is twice a day, once in the morning and once before bed."
+}
+
+# The buttons for each skin type with descriptions
+button_data = [
+    ("Dry", "Dry skin lacks moisture and often feels tight and rough.\nProper hydration, gentle cleansers, and nourishing moisturizers are essential for a healthy, radiant complexion."),
+    ("Oily", "Oily skin produces excess sebum, resulting in a shiny, greasy appearance.\nBalancing oil production and using non-comedogenic products can help control shine and maintain a clearer complexion."),
+    ("Combination", "Combination skin has both oily and dry areas.\nA skincare routine addressing both types is essential for a balanced complexion."),
+    ("Sensitive", "Sensitive skin is easily irritated and reactive to various factors.\nUsing gentle, hypoallergenic products can help soothe and protect sensitive skin.")
+]
+
+# Get the detailed product description for a specific skin type and product index (1-based).
+# The descriptions live in the product catalog (catalog.json), which is loaded on first use.
+def get_product_description(skin_type, index):
+    from nkahoots.catalog import get_catalog
+    return get_catalog().by_skin_type(skin_type)[index - 1].full_description()
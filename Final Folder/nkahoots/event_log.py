@@ -0,0 +1,191 @@
+# Module: event_log
+# Description: Usage event log for the Beauty Bot. log() only puts the event on a queue; a background
+#              writer thread keeps the log file open with a large buffer, writes the events and flushes
+#              them according to the chosen policy, so the Tk thread never waits on disk I/O.
+#
+#              Flush policies:
+#              - "event":    flush after every event (fsync too when fsync=True)
+#              - "interval": flush at most every flush_interval seconds
+#              - "exit":     flush only when the buffer is full and when the log is closed
+#
+#              The file is rotated when it grows past max_bytes and, if rotate_daily is set, when the
+#              first event of a new day is written. Rotated files are renamed to
+#              <name>.<YYYY-MM-DD>.<n>.csv next to the live file.
+#
+#              Record format, one line per event: "YYYY-MM-DD HH:MM:SS,<code>[,<detail>]". Older logs contain
+#              bare timestamp lines; readers treat those as launches.
+
+import atexit
+import csv
+from datetime import datetime
+import io
+import os
+import queue
+import threading
+import time
+
+# Constants
+LOG_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "application_dates.csv")
+BUFFER_SIZE = 64 * 1024
+MAX_BYTES = 10 * 1024 * 1024
+FLUSH_POLICIES = ("event", "interval", "exit")
+
+# Single-letter codes keep the records short
+EVENT_CODES = {
+    "launch": "L",
+    "skin_type_viewed": "V",
+    "reminder_set": "R",
+    "reminder_fired": "F",
+    "startup": "S",
+}
+EVENT_NAMES = {code: name for name, code in EVENT_CODES.items()}
+
+_STOP = object()
+
+
+class EventLog:
+    def __init__(self, path=LOG_PATH, flush_policy="interval", flush_interval=1.0, fsync=False,
+                 max_bytes=MAX_BYTES, rotate_daily=False):
+        if flush_policy not in FLUSH_POLICIES:
+            raise ValueError("flush_policy must be one of {}".format(", ".join(FLUSH_POLICIES)))
+        self.path = path
+        self.flush_policy = flush_policy
+        self.flush_interval = flush_interval
+        self.fsync = fsync
+        self.max_bytes = max_bytes
+        self.rotate_daily = rotate_daily
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+        self._closed = False
+        # Only used by the writer thread
+        self._file = None
+        self._file_date = None
+        self._file_size = 0
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    # Record an event; returns immediately, the write happens on the writer thread
+    def log(self, event, detail=None, when=None):
+        if self._closed:
+            return
+        code = EVENT_CODES.get(event, event)
+        self._start()
+        self._queue.put((when or datetime.now(), code, detail))
+
+    # Wait until every event logged so far has been written and flushed
+    def flush(self, timeout=None):
+        if self._thread is None or self._closed:
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait(timeout)
+
+    def close(self):
+        if self._closed:
+            return
+        self._closed = True
+        if self._thread is not None:
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _start(self):
+        if self._thread is not None:
+            return
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="event-log-writer", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+
+    # Writer thread
+    def _run(self):
+        while True:
+            timeout = None
+            if self._dirty and self.flush_policy == "interval":
+                timeout = max(0.0, self._last_flush + self.flush_interval - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                self._flush_file()
+                continue
+
+            if item is _STOP:
+                self._flush_file()
+                self._close_file()
+                return
+            if isinstance(item, threading.Event):
+                self._flush_file()
+                item.set()
+                continue
+
+            try:
+                self._write(item)
+            except OSError as error:
+                print(f"Could not write usage event: {error}")
+            if self.flush_policy == "event":
+                self._flush_file()
+            elif self.flush_policy == "interval" and time.monotonic() - self._last_flush >= self.flush_interval:
+                # A steady stream of events never lets get() time out, so check the interval here too
+                self._flush_file()
+
+    def _write(self, item):
+        when, code, detail = item
+        if self._file is None:
+            self._open_file()
+        if self._needs_rotation(when):
+            self._rotate()
+
+        row = io.StringIO()
+        fields = [when.strftime("%Y-%m-%d %H:%M:%S"), code]
+        if detail is not None:
+            fields.append(detail)
+        csv.writer(row).writerow(fields)
+        line = row.getvalue()
+        self._file.write(line)
+        self._file_size += len(line.encode("utf-8"))
+        self._file_date = when.date()
+        self._dirty = True
+
+    def _needs_rotation(self, when):
+        if self._file_size >= self.max_bytes:
+            return True
+        return self.rotate_daily and self._file_date is not None and when.date() != self._file_date
+
+    def _open_file(self):
+        self._file = open(self.path, "a", newline="", encoding="utf-8", buffering=BUFFER_SIZE)
+        try:
+            info = os.stat(self.path)
+            self._file_size = info.st_size
+            self._file_date = datetime.fromtimestamp(info.st_mtime).date() if info.st_size else None
+        except OSError:
+            self._file_size = 0
+            self._file_date = None
+
+    def _rotate(self):
+        self._flush_file()
+        self._close_file()
+        stem, extension = os.path.splitext(self.path)
+        date_text = (self._file_date or datetime.now().date()).strftime("%Y-%m-%d")
+        number = 1
+        while os.path.exists("{}.{}.{}{}".format(stem, date_text, number, extension)):
+            number += 1
+        os.replace(self.path, "{}.{}.{}{}".format(stem, date_text, number, extension))
+        self._open_file()
+
+    def _flush_file(self):
+        if self._file is None or not self._dirty:
+            return
+        try:
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+        except OSError as error:
+            print(f"Could not flush usage log: {error}")
+        self._dirty = False
+        self._last_flush = time.monotonic()
+
+    def _close_file(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
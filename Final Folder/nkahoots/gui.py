@@ -0,0 +1,449 @@
+# Module: gui
+# Description: The tkinter windows of the N'Kahoots Beauty Bot. Nothing is created on import; main() records
+#              the launch, builds the main window and runs the Tk event loop. Product images come from the
+#              prebuilt thumbnail atlas when there is one (python -m nkahoots.assets); otherwise they are
+#              decoded with PIL, which is then imported on first use.
+
+import tkinter as tk
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from tkinter import messagebox
+import os
+import re  # Import the regular expression module for input validation
+import time
+
+from nkahoots.assets import IMAGE_DIR, get_atlas
+from nkahoots.catalog import get_catalog
+from nkahoots.data import best_times, button_data, skin_data
+from nkahoots.event_log import EventLog
+from nkahoots.image_loader import ImageLoader
+from nkahoots.instrument import register_counters, start_periodic_summary, traced, write_summary
+from nkahoots.reminders import ReminderScheduler
+from nkahoots.thumbnails import thumbnail_cache
+from nkahoots.widgets import VirtualList
+
+# Constants
+PRODUCT_ROW_HEIGHT = 170
+PHOTO_CACHE_SIZE = 64
+
+# Usage events (launches, skin types viewed, reminders) are written to application_dates.csv next to the
+# program by a background writer, so logging never waits on the disk
+event_log = EventLog()
+
+# Created by main()
+root = None
+image_loader = None
+reminder_scheduler = None
+
+# Windows kept for reuse, by skin type
+product_windows = {}
+schedule_windows = {}
+reminder_windows = {}
+# Tk images of recently shown thumbnails, by image path (least recently used first)
+photo_cache = OrderedDict()
+
+# Sub to record the current application date and time to a CSV file
+@traced("record_application_date")
+def record_application_date():
+    event_log.log("launch")
+
+
+# Display a reminder message for skincare routine consistency
+def display_reminder(skin_type):
+    event_log.log("reminder_fired", skin_type)
+    reminder = "Consistency is key for healthy, glowing skin! 🌟\n"
+    reminder += f"You're one day closer to turning your {skin_type} skin into healthier, radiant skin!"
+    messagebox.showinfo("Reminder", reminder)
+
+# Open the window with the recommended products and skincare schedule for the selected skin type.
+# There is one product window per skin type: closing it only hides it and opening it again shows the same
+# window, so the widgets are built once instead of on every click.
+@traced("open_product_window")
+def open_product_window(skin_type): # Code for the product window follows
+    event_log.log("skin_type_viewed", skin_type)
+    if reuse_window(product_windows, skin_type) is None:
+        product_windows[skin_type] = build_product_window(skin_type)
+
+# Show the window kept in `windows` under key again and return it, or return None if it has to be built
+def reuse_window(windows, key):
+    window = windows.get(key)
+    if window is not None and window.winfo_exists():
+        window.deiconify()
+        window.lift()
+        window.focus_set()
+        return window
+    windows.pop(key, None)
+    return None
+
+# Closing a reusable window hides it so it can be shown again later
+def make_reusable(window):
+    window.protocol("WM_DELETE_WINDOW", window.withdraw)
+
+def build_product_window(skin_type):
+    product_window = tk.Toplevel(root)
+    product_window.title("Products for {} Skin".format(skin_type))
+    make_reusable(product_window)
+
+    skin_label = tk.Label(product_window, text="Skin Type: {}".format(skin_type))
+    skin_label.pack()
+
+    # Best times to wash face label
+    best_times_label = tk.Label(product_window, text=best_times[skin_type])
+    best_times_label.pack(pady=5)
+
+    description_label = tk.Label(product_window, text="Description:")
+    description_label.pack()
+
+    description_details_label = tk.Label(product_window, text=skin_data[skin_type]["description"])
+    description_details_label.pack(pady=5)
+
+    # The button to open the skincare schedule window
+    schedule_button = tk.Button(product_window, text="View your Skincare Schedule", command=lambda st=skin_type: open_schedule_window(st, product_window))
+    schedule_button.pack(pady=5)
+
+    # Images are decoded on worker threads. Closing the window only hides it, so hiding it drops the images
+    # that have not started loading yet and showing it again asks for them afresh.
+    image_batch = image_loader.batch_for(product_window)
+
+    # Scrollable product list; only the rows on screen have widgets, however many products there are
+    product_list = VirtualList(product_window, PRODUCT_ROW_HEIGHT,
+                               create_product_row,
+                               lambda row, product: fill_product_row(row, product, image_batch),
+                               visible_rows=3)
+    product_list.pack(pady=10, fill=tk.BOTH, expand=True)
+    product_list.set_items(get_catalog().by_skin_type(skin_type))
+
+    dropped_images = [False]
+
+    def on_unmap(event):
+        # <Unmap> and <Map> are also delivered for every child widget, only react to the window itself
+        if event.widget is product_window:
+            dropped_images[0] = image_batch.cancel_pending() or dropped_images[0]
+
+    def on_map(event):
+        if event.widget is product_window and dropped_images[0]:
+            dropped_images[0] = False
+            product_list.refresh()
+
+    product_window.bind("<Unmap>", on_unmap, add="+")
+    product_window.bind("<Map>", on_map, add="+")
+
+    # Button to close the product window (exit button)
+    exit_button = tk.Button(product_window, text="Exit", command=product_window.withdraw)
+    exit_button.pack(pady=10)
+    return product_window
+
+# The widgets of one row in the product list
+class ProductRow:
+    def __init__(self, image_label, name_label, description_label):
+        self.image_label = image_label
+        self.name_label = name_label
+        self.description_label = description_label
+        self.product = None
+        self.pending = None  # image request still running for this row
+
+def create_product_row(parent):
+    # Placeholder frame of the final 150x150 size so the layout does not jump when the image arrives
+    image_frame = tk.Frame(parent, width=150, height=150)
+    image_frame.pack_propagate(False)
+    image_frame.pack(side=tk.LEFT, padx=5, pady=5)
+    product_image_label = tk.Label(image_frame, text="Loading...")
+    product_image_label.pack(expand=True, fill=tk.BOTH)
+
+    text_frame = tk.Frame(parent)
+    text_frame.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=5)
+    # Label to display the product name with a bold font
+    product_label = tk.Label(text_frame, font=("Helvetica", 12, "bold"), wraplength=330, justify=tk.LEFT)
+    product_label.pack(anchor=tk.W, pady=5)
+    # Display the product description with wraplength set to 330 (adjust as needed)
+    product_description_label = tk.Label(text_frame, wraplength=330, justify=tk.LEFT)
+    product_description_label.pack(anchor=tk.W)
+    return ProductRow(product_image_label, product_label, product_description_label)
+
+# Show a product in a (possibly reused) row of the product list
+def fill_product_row(row, product, image_batch):
+    row.product = product
+    row.name_label.config(text=product.name)
+    row.description_label.config(text="Product Description:\n{}".format(product.full_description()))
+
+    # A request for the product this row showed before is no longer needed
+    if row.pending is not None:
+        row.pending.cancel()
+        row.pending = None
+
+    image_path = os.path.join(IMAGE_DIR, product.image)
+    photo = photo_cache.get(image_path)
+    if photo is not None:
+        photo_cache.move_to_end(image_path)
+    else:
+        photo = load_atlas_photo(image_path, product.image)
+    if photo is not None:
+        row.image_label.config(image=photo, text="")
+        row.image_label.image = photo
+        return
+    row.image_label.config(image="", text="Loading...")
+    row.pending = image_batch.request(image_path, (150, 150),
+                                      lambda image, error, path=image_path, shown=product:
+                                      show_product_image(path, image, error, row, shown))
+
+# Create the PhotoImage straight from the prebuilt thumbnail atlas (see nkahoots.assets), which Tk can
+# read without PIL. Returns None when the atlas has not been built or does not have this image.
+def load_atlas_photo(image_path, image_name):
+    atlas = get_atlas()
+    if atlas is None or atlas.size != (150, 150):
+        return None
+    data = atlas.photo_data(image_name)
+    if data is None:
+        return None
+    photo = tk.PhotoImage(data=data, format=atlas.format)
+    remember_photo(image_path, photo)
+    return photo
+
+# Keep a bounded number of PhotoImages so scrolling back does not convert the image again
+def remember_photo(image_path, photo):
+    photo_cache[image_path] = photo
+    if len(photo_cache) > PHOTO_CACHE_SIZE:
+        photo_cache.popitem(last=False)
+
+# Called on the Tk thread once a product thumbnail has been loaded (or failed to load)
+def show_product_image(image_path, image, error, row, product):
+    if row.product is not product:
+        return  # the row has been scrolled to another product in the meantime
+    row.pending = None
+    if error is not None:
+        if isinstance(error, FileNotFoundError):
+            print(f"Image not found: {image_path}")
+        else:
+            print(f"Could not load image {image_path}: {error}")
+        row.image_label.config(image="", text="No image")
+        row.description_label.config(text="Product Description: N/A")
+        return
+    from PIL import ImageTk  # only needed once an image is shown
+    photo = ImageTk.PhotoImage(image)
+    remember_photo(image_path, photo)
+    row.image_label.config(image=photo, text="")
+    row.image_label.image = photo
+
+# Open the skincare schedule window for a skin type; like the product window it is built once and reused
+@traced("open_schedule_window")
+def open_schedule_window(skin_type, product_window):
+    if reuse_window(schedule_windows, skin_type) is not None:
+        return
+
+    def set_reminder():
+        if reuse_window(reminder_windows, skin_type) is not None:
+            return
+        reminder_window = tk.Toplevel(schedule_window)
+        reminder_window.title("Set Daily Reminder")
+        make_reusable(reminder_window)
+        reminder_windows[skin_type] = reminder_window
+
+        date_label = tk.Label(reminder_window, text="Date (MM-DD):")
+        date_label.pack()
+        date_entry = tk.Entry(reminder_window)
+        date_entry.pack()
+
+        time_label = tk.Label(reminder_window, text="Time (HH:MM):")
+        time_label.pack()
+        time_entry = tk.Entry(reminder_window)
+        time_entry.pack()
+
+        am_pm_frame = tk.Frame(reminder_window)
+        am_pm_frame.pack(pady=5)
+
+        am_var = tk.StringVar(value="AM")
+        am_button = tk.Radiobutton(am_pm_frame, text="AM", variable=am_var, value="AM")
+        am_button.pack(side=tk.LEFT)
+
+        pm_button = tk.Radiobutton(am_pm_frame, text="PM", variable=am_var, value="PM")
+        pm_button.pack(side=tk.LEFT)
+
+        # Call the set_reminder_handler function with necessary arguments
+        set_reminder_button = tk.Button(reminder_window, text="Set Reminder", command=lambda: set_reminder_handler(skin_type, date_entry, time_entry, am_var, status_label))
+        set_reminder_button.pack(pady=5)
+
+        # The reminder already set for this skin type, refreshed whenever the window is shown again
+        status_label = tk.Label(reminder_window, text=describe_reminder(skin_type))
+        status_label.pack(pady=5)
+        reminder_window.bind("<Map>", lambda event: event.widget is reminder_window and status_label.config(text=describe_reminder(skin_type)))
+
+        cancel_reminder_button = tk.Button(reminder_window, text="Cancel Reminder", command=lambda: cancel_reminder_handler(skin_type, status_label))
+        cancel_reminder_button.pack(pady=5)
+
+        # Create the schedule window
+    schedule_window = tk.Toplevel(product_window)
+    schedule_window.title("Daily Skincare Schedule for {} Skin".format(skin_type))
+    make_reusable(schedule_window)
+    schedule_windows[skin_type] = schedule_window
+    # Label for the skincare schedule
+    schedule_label = tk.Label(schedule_window, text="Skincare Schedule:")
+    schedule_label.pack()
+    # Label displaying the skincare schedule details based on the selected skin type
+    schedule_details_label = tk.Label(schedule_window, text=skin_data[skin_type]["schedule"])
+    schedule_details_label.pack(pady=5)
+    # Label for displaying the best times to wash face based on the selected skin type
+    best_times_label = tk.Label(schedule_window, text="Best Times to Wash Face:")
+    best_times_label.pack()
+    # Label displaying the best times to wash face details based on the selected skin type
+    best_times_details_label = tk.Label(schedule_window, text=best_times[skin_type])
+    best_times_details_label.pack(pady=5)
+    # Button to set a daily reminder for the skincare routine
+    reminder_button = tk.Button(schedule_window, text="Set Daily Reminder", command=set_reminder)
+    reminder_button.pack(pady=5)
+
+# The daily reminders set for a skin type (there is normally at most one)
+def reminders_for(skin_type):
+    return [reminder for reminder in reminder_scheduler.pending() if reminder.skin_type == skin_type]
+
+def describe_reminder(skin_type):
+    reminders = reminders_for(skin_type)
+    if not reminders:
+        return "No daily reminder set."
+    return "Daily reminder at {}, next on {}.".format(reminders[0].due.strftime("%I:%M %p"), reminders[0].due.strftime("%m-%d"))
+
+# Stop the daily reminder for a skin type
+def cancel_reminder_handler(skin_type, status_label):
+    reminders = reminders_for(skin_type)
+    if not reminders:
+        messagebox.showinfo("No Reminder", "There is no daily reminder to cancel.")
+        return
+    if messagebox.askyesno("Cancel Reminder", "Stop the daily reminder for {} skin?".format(skin_type)):
+        for reminder in reminders:
+            reminder_scheduler.cancel(reminder.reminder_id)
+        status_label.config(text=describe_reminder(skin_type))
+        messagebox.showinfo("Reminder Cancelled", "Daily reminder has been cancelled.")
+
+# Set the daily reminder for a skin type from the reminder window. A skin type has one reminder: setting
+# it again moves the existing reminder instead of adding another one.
+def set_reminder_handler(skin_type, date_entry, time_entry, am_var, status_label=None):
+        # Retrieve the date, time, and AM/PM selection from user inputs
+        date = date_entry.get()
+        time = time_entry.get()
+        am_pm = am_var.get()
+
+        # Validate date format (MM-DD)
+        if not re.match(r"^\d{2}-\d{2}$", date):
+            messagebox.showerror("Invalid Date", "Please enter the date in the format MM-DD.")
+            return
+
+        # Validate time format (HH:MM)
+        if not re.match(r"^\d{2}:\d{2}$", time):
+            messagebox.showerror("Invalid Time", "Please enter the time in the format HH:MM.")
+            return
+        # Convert the user-entered date, time, and AM/PM to a datetime object in the current year
+        now = datetime.now()
+        try:
+            reminder_datetime = datetime.strptime("{}-{} {} {}".format(now.year, date, time, am_pm), "%Y-%m-%d %I:%M %p")
+        except ValueError:
+            messagebox.showerror("Invalid Date", "Please enter a real date (MM-DD) and a time between 01:00 and 12:59.")
+            return
+        # A date earlier in the year is taken to mean that date next year
+        if reminder_datetime.date() < now.date():
+            try:
+                reminder_datetime = reminder_datetime.replace(year=now.year + 1)
+            except ValueError:
+                messagebox.showerror("Invalid Date", "{} does not exist next year. Please choose another date.".format(date))
+                return
+        # Check if the chosen time has already passed today, prompt to set an appointment for tomorrow if needed
+        elif reminder_datetime <= now:
+            if messagebox.askyesno("Time Passed", "The chosen time has already passed. Would you like to set an appointment for tomorrow or the following day?"):
+                reminder_datetime += timedelta(days=1)
+            else:
+                return
+        # Hand the reminder to the scheduler, which repeats it every day from the chosen time
+        existing = reminders_for(skin_type)
+        if existing:
+            reminder_scheduler.reschedule(existing[0].reminder_id, reminder_datetime)
+            for duplicate in existing[1:]:
+                reminder_scheduler.cancel(duplicate.reminder_id)
+        else:
+            reminder_scheduler.add(skin_type, reminder_datetime)
+        event_log.log("reminder_set", skin_type)
+        # The window is reused, so clear the entries for the next change
+        date_entry.delete(0, tk.END)
+        time_entry.delete(0, tk.END)
+        if status_label is not None:
+            status_label.config(text=describe_reminder(skin_type))
+        messagebox.showinfo("Reminder Set", "Daily reminder has been changed." if existing else "Daily reminder has been set.")
+         
+        
+
+def show_skin_type_instructions():
+    messagebox.showinfo("How to Pick Your Skin Type",
+                        "Welcome to N'kahoots Skin Type Selector!\n\n"
+                        "Please read the descriptions of each skin type below and select the one that best "
+                        "matches your skin characteristics. Once you choose your skin type, you will see "
+                        "the recommended products and skincare schedule.\n\n"
+                        "Dry Skin: Lacks moisture and often feels tight and rough. Proper hydration, gentle cleansers, and nourishing moisturizers are essential for a healthy, radiant complexion.\n\n"
+                        "Oily Skin: Produces excess sebum, resulting in a shiny, greasy appearance. Balancing oil production and using non-comedogenic products can help control shine and maintain a clearer complexion.\n\n"
+                        "Combination Skin: Characterized by both oily and dry areas. A skincare routine addressing both types is essential for a balanced complexion.\n\n"
+                        "Sensitive Skin: Easily irritated and reactive to various factors. Using gentle, hypoallergenic products can help soothe and protect sensitive skin.\n\n"
+                        "Reminder: After selecting your skin type and viewing the recommended products and skincare schedule, you have the option to set a daily reminder for your skincare routine.\n Click on the 'Set Daily Reminder' button to choose a date and time for your daily reminder. If the chosen time has already passed, you will be prompted to set an appointment for tomorrow or the following day.\n\n"
+                        "Consistency is key for achieving healthy, glowing skin! Your daily reminder will help you stay on track with your skincare routine and work towards improving your skin's health and appearance.\n")
+
+# Exit button callback function
+def exit_application():
+    if messagebox.askyesno("Exit", "Are you sure you want to exit the application?"):
+        image_loader.shutdown()
+        reminder_scheduler.shutdown()
+        event_log.close()
+        root.destroy()
+
+# Print and log how long it took from process start to the main window being drawn
+def report_startup_time(started):
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    print(f"Main window drawn {elapsed_ms:.1f} ms after start")
+    event_log.log("startup", "{:.1f}".format(elapsed_ms))
+
+# Build the main window and run the program. `started` is the time.perf_counter() value taken when the
+# program started and is used for the startup time measurement.
+def main(started=None):
+    global root, image_loader, reminder_scheduler
+    if started is None:
+        started = time.perf_counter()
+
+    record_application_date()
+
+    # the main window
+    root = tk.Tk()
+    root.title("N'Kahoots Beauty Bot")
+    # Worker pool that loads product images without blocking the main window
+    image_loader = ImageLoader(root)
+    # Single scheduler for all daily reminders, restored from disk and driven by the Tk event loop
+    reminder_scheduler = ReminderScheduler(root, lambda reminder: display_reminder(reminder.skin_type))
+    reminder_scheduler.start()
+
+    # Skin Type Selector Instructions
+    instruction_label = tk.Label(root, text="How to Pick Your Skin Type", font=("Helvetica", 14, "bold"))
+    instruction_label.pack(pady=10)
+
+    show_instructions_button = tk.Button(root, text="Read Me!", command=show_skin_type_instructions)
+    show_instructions_button.pack()
+
+    # Loop through the skin types and create buttons for each with their descriptions
+    for skin_type, description in button_data:
+        button = tk.Button(root, text=skin_type, command=lambda st=skin_type: open_product_window(st))
+        button.pack(pady=5)
+
+        desc_label = tk.Label(root, text=description)
+        desc_label.pack()
+
+    # Button to exit the application
+    exit_button = tk.Button(root, text="Exit", command=exit_application)
+    exit_button.pack(pady=5)
+
+    # The first <Map> of the main window is when it is actually drawn on screen
+    def on_first_map(event):
+        if event.widget is root:
+            root.unbind("<Map>", map_binding)
+            report_startup_time(started)
+
+    map_binding = root.bind("<Map>", on_first_map)
+
+    # With NKAHOOTS_TRACE=1 the timing summary and the thumbnail cache counters are written to metrics.jsonl
+    # every minute and on exit
+    register_counters("thumbnail_cache", thumbnail_cache.stats)
+    start_periodic_summary(root)
+
+    root.mainloop()
+    write_summary()
@@ -0,0 +1,116 @@
+# Module: image_loader
+# Description: Loads product thumbnails on a pool of worker threads so the product window can be drawn
+#              straight away. Finished images are put on a queue which the Tk main thread drains with
+#              root.after(), because Tk widgets and PhotoImages may only be touched from that thread.
+#              Each window gets its own batch; destroying the window cancels the batch so work that is
+#              still queued is dropped and late results are ignored. Windows that are only hidden can drop
+#              their queued work with cancel_pending() and keep using the batch when shown again.
+
+from concurrent.futures import ThreadPoolExecutor
+import queue
+
+from nkahoots.thumbnails import thumbnail_cache
+
+# Constants
+MAX_WORKERS = 4
+POLL_INTERVAL_MS = 20
+
+
+class ImageBatch:
+    def __init__(self, loader):
+        self._loader = loader
+        self._futures = []
+        self.cancelled = False
+
+    # Queue image_path for loading; callback(image, error) is later called on the Tk thread.
+    # Returns the future, which can be cancelled if the image is no longer wanted.
+    def request(self, image_path, size, callback):
+        if self.cancelled:
+            return None
+        future = self._loader._submit(self, image_path, size, callback)
+        if len(self._futures) >= 64:
+            # Long-lived windows keep requesting images while they are scrolled; forget finished ones
+            self._futures = [pending for pending in self._futures if not pending.done()]
+        self._futures.append(future)
+        return future
+
+    # Drop every request of this batch that has not started yet; the batch can still be used afterwards.
+    # Returns True when anything was dropped.
+    def cancel_pending(self):
+        dropped = False
+        for future in self._futures:
+            dropped = future.cancel() or dropped
+        self._futures.clear()
+        return dropped
+
+    # Drop every request of this batch that has not been delivered yet and refuse new ones
+    def cancel(self):
+        self.cancelled = True
+        self.cancel_pending()
+
+
+class ImageLoader:
+    def __init__(self, root, cache=thumbnail_cache, max_workers=MAX_WORKERS):
+        self.root = root
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="image-loader")
+        self._results = queue.Queue()
+        self._outstanding = set()  # futures submitted but not yet finished
+        self._polling = False
+
+    # Start a new batch tied to a window; the batch is cancelled as soon as the window is destroyed
+    def batch_for(self, window):
+        batch = ImageBatch(self)
+
+        def on_destroy(event):
+            # <Destroy> is also delivered for every child widget, only react to the window itself
+            if event.widget is window:
+                batch.cancel()
+
+        window.bind("<Destroy>", on_destroy, add="+")
+        return batch
+
+    def _submit(self, batch, image_path, size, callback):
+        future = self._executor.submit(self._load, batch, image_path, size, callback)
+        self._outstanding.add(future)
+        self._start_polling()
+        return future
+
+    # Runs on a worker thread
+    def _load(self, batch, image_path, size, callback):
+        if batch.cancelled:
+            return
+        try:
+            image = self.cache.get(image_path, size)
+            self._results.put((batch, callback, image, None))
+        except Exception as error:
+            self._results.put((batch, callback, None, error))
+
+    def _start_polling(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(POLL_INTERVAL_MS, self._drain)
+
+    # Runs on the Tk thread: hand every finished image to its callback
+    def _drain(self):
+        while True:
+            try:
+                batch, callback, image, error = self._results.get_nowait()
+            except queue.Empty:
+                break
+            if batch.cancelled:
+                continue
+            try:
+                callback(image, error)
+            except Exception as callback_error:
+                print(f"Image callback failed: {callback_error}")
+
+        # Keep polling only while something is still running or waiting to be delivered
+        self._outstanding = {future for future in self._outstanding if not future.done()}
+        if self._outstanding or not self._results.empty():
+            self.root.after(POLL_INTERVAL_MS, self._drain)
+        else:
+            self._polling = False
+
+    def shutdown(self):
+        self._executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,214 @@
+# Module: instrument
+# Description: Lightweight timing instrumentation for the Beauty Bot. Set NKAHOOTS_TRACE=1 before starting the
+#              program to turn it on. When it is off, @traced returns the decorated function unchanged and
+#              span() hands back one shared do-nothing object, so the hot paths run as if this module did
+#              not exist.
+#
+#              Every span records its duration in milliseconds under its name; record() adds any other
+#              measurement (for example reminder drift). For each name the count, mean and maximum are kept
+#              plus a bounded sample of recent values from which p50/p95/p99 are computed. summary() returns
+#              the figures in-process and write_summary() appends them as one JSON line to a metrics file
+#              that is rotated once it grows past MAX_FILE_BYTES. Counters that are not timings (such as the
+#              thumbnail cache hits) are registered with register_counters() and written alongside.
+#
+# Usage: python -m nkahoots.instrument [metrics file]   (prints the latest summary in the file)
+
+from collections import deque
+import functools
+import json
+import math
+import os
+import sys
+import threading
+import time
+
+# Constants
+ENABLED = os.environ.get("NKAHOOTS_TRACE", "") not in ("", "0")
+METRICS_PATH = os.environ.get("NKAHOOTS_METRICS_FILE") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "metrics.jsonl")
+SAMPLE_SIZE = 2048  # recent values kept per metric for the percentiles
+MAX_FILE_BYTES = 1024 * 1024
+SUMMARY_INTERVAL_MS = 60 * 1000
+
+
+class Metric:
+    __slots__ = ("count", "total", "maximum", "samples")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+        self.samples = deque(maxlen=SAMPLE_SIZE)
+
+
+_metrics = {}
+_counters = {}  # name -> function returning a dict of counters
+_lock = threading.Lock()  # spans are also recorded from the image worker threads
+
+
+def record(name, value):
+    if not ENABLED:
+        return
+    with _lock:
+        metric = _metrics.get(name)
+        if metric is None:
+            metric = _metrics[name] = Metric()
+        metric.count += 1
+        metric.total += value
+        metric.maximum = max(metric.maximum, value)
+        metric.samples.append(value)
+
+
+class _Span:
+    __slots__ = ("name", "started")
+
+    def __init__(self, name):
+        self.name = name
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        record(self.name, (time.perf_counter() - self.started) * 1000)
+        return False
+
+
+class _NullSpan:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        return False
+
+
+_NULL_SPAN = _NullSpan()
+
+
+# Time a block of code: with span("thumbnail.decode_resize"): ...
+def span(name):
+    return _Span(name) if ENABLED else _NULL_SPAN
+
+
+# Time every call of the decorated function (under its own name unless one is given)
+def traced(name=None):
+    def decorate(function):
+        if not ENABLED:
+            return function
+        span_name = name or function.__name__
+
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return function(*args, **kwargs)
+            finally:
+                record(span_name, (time.perf_counter() - started) * 1000)
+
+        return wrapper
+
+    return decorate
+
+
+# Nearest-rank percentile of an already sorted list
+def _percentile(values, fraction):
+    index = max(0, min(len(values) - 1, math.ceil(fraction * len(values)) - 1))
+    return values[index]
+
+
+def summary():
+    with _lock:
+        snapshot = {name: (metric.count, metric.total, metric.maximum, sorted(metric.samples))
+                    for name, metric in _metrics.items()}
+    result = {}
+    for name, (count, total, maximum, values) in sorted(snapshot.items()):
+        result[name] = {
+            "count": count,
+            "mean": round(total / count, 3),
+            "p50": round(_percentile(values, 0.50), 3),
+            "p95": round(_percentile(values, 0.95), 3),
+            "p99": round(_percentile(values, 0.99), 3),
+            "max": round(maximum, 3),
+        }
+    return result
+
+
+# Write the dict returned by stats() under `name` with every summary (does nothing when tracing is off)
+def register_counters(name, stats):
+    if ENABLED:
+        _counters[name] = stats
+
+
+def counters():
+    return {name: stats() for name, stats in sorted(_counters.items())}
+
+
+def reset():
+    with _lock:
+        _metrics.clear()
+
+
+# Append the current summary to the metrics file, moving a full file to <path>.1 first
+def write_summary(path=METRICS_PATH):
+    metrics = summary()
+    counter_values = counters()
+    if not metrics and not counter_values:
+        return
+    entry = {"time": time.strftime("%Y-%m-%d %H:%M:%S"), "metrics": metrics}
+    if counter_values:
+        entry["counters"] = counter_values
+    line = json.dumps(entry) + "\n"
+    try:
+        if os.path.exists(path) and os.path.getsize(path) + len(line) > MAX_FILE_BYTES:
+            os.replace(path, path + ".1")
+        with open(path, "a") as file:
+            file.write(line)
+    except OSError as error:
+        print(f"Could not write metrics: {error}")
+
+
+# Write the summary every SUMMARY_INTERVAL_MS from the Tk loop (does nothing when tracing is off)
+def start_periodic_summary(root, path=METRICS_PATH):
+    if not ENABLED:
+        return
+
+    def tick():
+        write_summary(path)
+        root.after(SUMMARY_INTERVAL_MS, tick)
+
+    root.after(SUMMARY_INTERVAL_MS, tick)
+
+
+def format_summary(metrics):
+    lines = ["{:<28} {:>7} {:>9} {:>9} {:>9} {:>9} {:>9}".format("metric (ms)", "count", "mean", "p50", "p95", "p99", "max")]
+    for name, values in metrics.items():
+        lines.append("{:<28} {:>7} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f} {:>9.2f}".format(
+            name, values["count"], values["mean"], values["p50"], values["p95"], values["p99"], values["max"]))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else argv
+    path = argv[0] if argv else METRICS_PATH
+    last = None
+    try:
+        with open(path) as file:
+            for line in file:
+                if line.strip():
+                    last = line
+    except FileNotFoundError:
+        pass
+    if last is None:
+        print(f"No metrics in {path} (start the program with NKAHOOTS_TRACE=1 to collect them)")
+        return
+    data = json.loads(last)
+    print("Metrics written at {}".format(data["time"]))
+    print(format_summary(data["metrics"]))
+    for name, values in data.get("counters", {}).items():
+        print("{}: {}".format(name, ", ".join("{}={}".format(key, value) for key, value in values.items())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,225 @@
+# Module: reminders
+# Description: One scheduler for every skincare reminder. Pending reminders sit in a min-heap ordered by
+#              their due time and a single root.after() callback on the Tk loop wakes up for the earliest
+#              one, so no extra threads are started and the reminder message box is shown from the Tk
+#              thread. Daily reminders are pushed back onto the heap for the next day after they fire.
+#              Reminders are saved to a JSON file so they survive a restart.
+#
+#              Cancelled and rescheduled reminders are not searched for in the heap; their old heap entries
+#              are simply skipped when they reach the top (lazy deletion), which keeps every operation at
+#              O(log n).
+
+from datetime import datetime, timedelta
+import heapq
+import itertools
+import json
+import os
+
+from nkahoots import instrument
+
+# Constants
+STORE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "reminders.json")
+MAX_WAIT_MS = 60 * 1000  # re-check at least once a minute in case the system clock changes
+SAVE_DELAY_MS = 500  # several changes in a row are written to disk together
+REPEAT_DAILY = "daily"
+
+
+class Reminder:
+    __slots__ = ("reminder_id", "skin_type", "due", "repeat")
+
+    def __init__(self, reminder_id, skin_type, due, repeat=None):
+        self.reminder_id = reminder_id
+        self.skin_type = skin_type
+        self.due = due  # naive local datetime
+        self.repeat = repeat
+
+    def to_dict(self):
+        return {
+            "id": self.reminder_id,
+            "skin_type": self.skin_type,
+            "due": self.due.strftime("%Y-%m-%d %H:%M:%S"),
+            "repeat": self.repeat,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data["id"], data["skin_type"], datetime.strptime(data["due"], "%Y-%m-%d %H:%M:%S"), data.get("repeat"))
+
+
+class ReminderScheduler:
+    # root is the Tk root window; callback(reminder) is called on the Tk thread whenever a reminder fires.
+    # Without a root the scheduler can still be driven by calling fire_due() directly.
+    def __init__(self, root, callback, store_path=STORE_PATH):
+        self.root = root
+        self.callback = callback
+        self.store_path = store_path
+        self._heap = []  # (due timestamp, sequence number, reminder id)
+        self._reminders = {}  # reminder id -> Reminder
+        self._sequence = itertools.count()
+        self._next_id = 1
+        self._after_id = None
+        self._armed_for = None
+        self._save_pending = False
+        self._started = datetime.now()
+
+    # Load the saved reminders and start waiting for the first one
+    def start(self):
+        self.load()
+        self._arm()
+
+    def add(self, skin_type, due, repeat=REPEAT_DAILY):
+        reminder = Reminder(self._next_id, skin_type, due, repeat)
+        self._next_id += 1
+        self._reminders[reminder.reminder_id] = reminder
+        self._push(reminder)
+        self._changed()
+        return reminder
+
+    def cancel(self, reminder_id):
+        # The heap entry stays behind and is skipped once it reaches the top
+        removed = self._reminders.pop(reminder_id, None)
+        if removed is not None:
+            self._changed()
+        return removed is not None
+
+    def reschedule(self, reminder_id, due):
+        reminder = self._reminders[reminder_id]
+        reminder.due = due
+        self._push(reminder)
+        self._changed()
+        return reminder
+
+    def pending(self):
+        return sorted(self._reminders.values(), key=lambda reminder: reminder.due)
+
+    def __len__(self):
+        return len(self._reminders)
+
+    def _push(self, reminder):
+        heapq.heappush(self._heap, (reminder.due.timestamp(), next(self._sequence), reminder.reminder_id))
+
+    # True when a heap entry still matches a live reminder (it may have been cancelled or rescheduled since)
+    def _is_current(self, entry):
+        reminder = self._reminders.get(entry[2])
+        return reminder is not None and reminder.due.timestamp() == entry[0]
+
+    def _drop_stale(self):
+        while self._heap and not self._is_current(self._heap[0]):
+            heapq.heappop(self._heap)
+
+    # Fire every reminder that is due at `now` and return them
+    def fire_due(self, now=None):
+        now = now or datetime.now()
+        now_ts = now.timestamp()
+        fired = []
+        self._drop_stale()
+        while self._heap and self._heap[0][0] <= now_ts:
+            entry = heapq.heappop(self._heap)
+            if not self._is_current(entry):
+                continue
+            reminder = self._reminders[entry[2]]
+            fired.append(reminder)
+            if instrument.ENABLED:
+                # Drift: how late the reminder fires compared with the time it was due. Reminders that were
+                # already due before the scheduler started (the program was closed) are recorded
+                # separately, so their hours or days of delay do not swamp the timer's drift percentiles.
+                late_ms = (datetime.now() - reminder.due).total_seconds() * 1000
+                instrument.record("reminder.drift_ms" if reminder.due >= self._started else "reminder.overdue_ms", late_ms)
+            if reminder.repeat == REPEAT_DAILY:
+                # Move to the next day that is still in the future (days missed while closed fire only once)
+                while reminder.due <= now:
+                    reminder.due += timedelta(days=1)
+                self._push(reminder)
+            else:
+                del self._reminders[reminder.reminder_id]
+            self._drop_stale()
+
+        if fired:
+            self._save_soon()
+        for reminder in fired:
+            try:
+                self.callback(reminder)
+            except Exception as error:
+                print(f"Reminder callback failed: {error}")
+        return fired
+
+    def _changed(self):
+        self._arm()
+        self._save_soon()
+
+    # Make sure exactly one root.after() callback is waiting for the earliest reminder
+    def _arm(self):
+        if self.root is None:
+            return
+        self._drop_stale()
+        if not self._heap:
+            self._disarm()
+            return
+        due_ts = self._heap[0][0]
+        if self._after_id is not None and self._armed_for == due_ts:
+            return
+        self._disarm()
+        delay_ms = int((due_ts - datetime.now().timestamp()) * 1000)
+        delay_ms = max(0, min(delay_ms, MAX_WAIT_MS))
+        self._armed_for = due_ts
+        self._after_id = self.root.after(delay_ms, self._on_timer)
+
+    def _disarm(self):
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+        self._after_id = None
+        self._armed_for = None
+
+    def _on_timer(self):
+        self._after_id = None
+        self._armed_for = None
+        self.fire_due()
+        self._arm()
+
+    # Without a Tk root, changes are only written by save() or shutdown()
+    def _save_soon(self):
+        if not self._save_pending:
+            self._save_pending = True
+            if self.root is not None:
+                self.root.after(SAVE_DELAY_MS, self.save)
+
+    def save(self):
+        self._save_pending = False
+        data = {
+            "next_id": self._next_id,
+            "reminders": [reminder.to_dict() for reminder in self._reminders.values()],
+        }
+        temp_path = self.store_path + ".tmp"
+        try:
+            with open(temp_path, "w") as file:
+                json.dump(data, file)
+            os.replace(temp_path, self.store_path)
+        except OSError as error:
+            print(f"Could not save reminders: {error}")
+
+    def load(self):
+        try:
+            with open(self.store_path) as file:
+                data = json.load(file)
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as error:
+            print(f"Could not load reminders: {error}")
+            return
+        self._heap = []
+        self._reminders = {}
+        for item in data.get("reminders", []):
+            try:
+                reminder = Reminder.from_dict(item)
+            except (KeyError, ValueError):
+                continue
+            self._reminders[reminder.reminder_id] = reminder
+            self._heap.append((reminder.due.timestamp(), next(self._sequence), reminder.reminder_id))
+        heapq.heapify(self._heap)
+        self._next_id = max([data.get("next_id", 1)] + [rid + 1 for rid in self._reminders])
+
+    # Write any pending changes and stop the timer (called when the application exits)
+    def shutdown(self):
+        self._disarm()
+        if self._save_pending:
+            self.save()
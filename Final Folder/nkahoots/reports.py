@@ -0,0 +1,263 @@
+# Module: reports
+# Description: Headless batch generation of personalized skincare routine reports. Reads a CSV of users
+#              (name, skin_type and an optional reminder_time) and writes one self-contained HTML file per
+#              user with the skincare schedule, tips, best times to wash, product descriptions and embedded
+#              product thumbnails for their skin type.
+#
+#              Everything that is the same for all users of a skin type (including the base64 thumbnails)
+#              is rendered once in the parent process and handed to each worker process when it starts.
+#              Users are read lazily and sent to a process pool in chunks, with only a few chunks in flight
+#              at a time, and every report is written straight to disk, so memory stays flat however many
+#              users there are. Problems with the input are counted, but only the first MAX_PROBLEM_MESSAGES
+#              messages are kept.
+#
+# Usage: python -m nkahoots.reports users.csv [-o reports] [--workers N] [--chunk-size N]
+
+import argparse
+import base64
+import csv
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from html import escape
+from itertools import islice
+import io
+import os
+import re
+import sys
+import time
+
+from nkahoots.assets import FOLDER, IMAGE_DIR, THUMBNAIL_SIZE, get_atlas
+from nkahoots.catalog import get_catalog
+from nkahoots.data import best_times, skin_data
+
+# Constants
+OUTPUT_DIR = os.path.join(FOLDER, "reports")
+CHUNK_SIZE = 500
+MAX_PROBLEM_MESSAGES = 20
+REMINDER_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})(\s?[AaPp][Mm])?$")
+
+PAGE_START = """<!DOCTYPE html>
+<html lang="en">
+<head>
+<meta charset="utf-8">
+<title>{title}</title>
+<style>
+body {{ font-family: Helvetica, Arial, sans-serif; max-width: 760px; margin: 2em auto; color: #222; }}
+h1 {{ margin-bottom: 0.2em; }}
+.routine {{ white-space: pre-line; }}
+.product {{ display: flex; gap: 1em; margin: 1em 0; }}
+.product img {{ width: {width}px; height: {height}px; flex: none; }}
+.note {{ background: #f4f0fa; padding: 0.6em 1em; border-radius: 6px; }}
+</style>
+</head>
+<body>
+"""
+PAGE_END = "</body>\n</html>\n"
+
+
+# Problems found in the input: every one is counted, only the first `limit` messages are kept
+class Problems:
+    def __init__(self, limit=MAX_PROBLEM_MESSAGES):
+        self.limit = limit
+        self.count = 0
+        self.messages = []
+
+    def add(self, message):
+        self.count += 1
+        if len(self.messages) < self.limit:
+            self.messages.append(message)
+
+    def extend(self, messages):
+        for message in messages:
+            self.add(message)
+
+
+# True for a reminder time such as 08:30, 20:30 or 8:30 PM
+def valid_reminder_time(text):
+    match = REMINDER_PATTERN.match(text)
+    if match is None:
+        return False
+    hour, minute = int(match.group(1)), int(match.group(2))
+    if minute > 59:
+        return False
+    return 1 <= hour <= 12 if match.group(3) else hour <= 23
+
+
+# The thumbnail of an image as a data: URI, from the PNG atlas when there is one, otherwise encoded with PIL
+def thumbnail_data_uri(image_name):
+    atlas = get_atlas()
+    if atlas is not None and atlas.format == "png" and image_name in atlas:
+        return "data:image/png;base64," + base64.b64encode(atlas.get_bytes(image_name)).decode("ascii")
+    from PIL import Image
+
+    try:
+        with Image.open(os.path.join(IMAGE_DIR, image_name)) as image:
+            thumbnail = image.convert("RGB").resize(THUMBNAIL_SIZE)
+    except FileNotFoundError:
+        return None
+    except OSError as error:
+        # A corrupt image leaves that product without a picture instead of stopping the run
+        print(f"Could not read image {image_name}: {error}", file=sys.stderr)
+        return None
+    output = io.BytesIO()
+    thumbnail.save(output, format="JPEG", quality=85)
+    return "data:image/jpeg;base64," + base64.b64encode(output.getvalue()).decode("ascii")
+
+
+# The part of a report that is the same for every user of a skin type
+def render_skin_type_section(skin_type):
+    data = skin_data[skin_type]
+    parts = [
+        "<h2>Your skin type: {}</h2>\n".format(escape(skin_type)),
+        "<p>{}</p>\n".format(escape(data["description"])),
+        "<p class=\"note\">{}</p>\n".format(escape(best_times[skin_type])),
+        "<h2>Daily skincare schedule</h2>\n<p class=\"routine\">{}</p>\n".format(escape(data["schedule"])),
+        "<h2>Tips</h2>\n<p class=\"routine\">{}</p>\n".format(escape(data["tips"])),
+        "<h2>Recommended products</h2>\n",
+    ]
+    for product in get_catalog().by_skin_type(skin_type):
+        image_uri = thumbnail_data_uri(product.image) if product.image else None
+        image_tag = '<img src="{}" alt="{}">'.format(image_uri, escape(product.name)) if image_uri else ""
+        parts.append("<div class=\"product\">{}<div><h3>{}</h3><p>{}</p></div></div>\n".format(
+            image_tag, escape(product.name), escape(product.full_description())))
+    return "".join(parts)
+
+
+def render_sections():
+    return {skin_type: render_skin_type_section(skin_type) for skin_type in skin_data}
+
+
+# Turn a user name into a safe file name
+def file_name_for(row_number, name):
+    slug = re.sub(r"[^A-Za-z0-9]+", "-", name).strip("-").lower()[:40] or "user"
+    return "{:07d}-{}.html".format(row_number, slug)
+
+
+# Set in every worker process by _init_worker
+_sections = None
+_output_dir = None
+
+
+def _init_worker(sections, output_dir):
+    global _sections, _output_dir
+    _sections = sections
+    _output_dir = output_dir
+
+
+def write_report(path, name, skin_type, reminder_time, sections):
+    with open(path, "w", encoding="utf-8") as file:
+        file.write(PAGE_START.format(title=escape("Skincare routine for " + name),
+                                     width=THUMBNAIL_SIZE[0], height=THUMBNAIL_SIZE[1]))
+        file.write("<h1>Hi {}!</h1>\n<p>Here is your personalized skincare routine from N'Kahoots Beauty Bot.</p>\n"
+                   .format(escape(name)))
+        if reminder_time:
+            file.write("<p class=\"note\">Daily reminder: {}. Consistency is key for healthy, glowing skin!</p>\n"
+                       .format(escape(reminder_time)))
+        file.write(sections[skin_type])
+        file.write(PAGE_END)
+
+
+# Runs in a worker: write the reports for one chunk of (row number, name, skin type, reminder time) rows.
+# Returns (number written, list of error messages).
+def _render_chunk(rows):
+    written = 0
+    errors = []
+    for row_number, name, skin_type, reminder_time in rows:
+        try:
+            write_report(os.path.join(_output_dir, file_name_for(row_number, name)),
+                         name, skin_type, reminder_time, _sections)
+            written += 1
+        except OSError as error:
+            errors.append("row {}: {}".format(row_number, error))
+    return written, errors
+
+
+# Read the users CSV lazily and yield valid (row number, name, skin type, reminder time) rows; problems are
+# added to `problems`
+def read_users(file, problems):
+    skin_types = {skin_type.lower(): skin_type for skin_type in skin_data}
+    reader = csv.DictReader(file)
+    fields = {field.strip().lower(): field for field in reader.fieldnames or []}
+    if "name" not in fields or "skin_type" not in fields:
+        raise ValueError("the users CSV needs name and skin_type columns")
+    reminder_field = fields.get("reminder_time")
+    for row_number, row in enumerate(reader, start=2):
+        name = (row.get(fields["name"]) or "").strip()
+        skin_type = skin_types.get((row.get(fields["skin_type"]) or "").strip().lower())
+        reminder_time = (row.get(reminder_field) or "").strip() if reminder_field else ""
+        if not name:
+            problems.add("row {}: missing name".format(row_number))
+        elif skin_type is None:
+            problems.add("row {}: unknown skin type {!r}".format(row_number, row.get(fields["skin_type"])))
+        elif reminder_time and not valid_reminder_time(reminder_time):
+            problems.add("row {}: reminder_time should look like 08:30 or 8:30 PM".format(row_number))
+        else:
+            yield row_number, name, skin_type, reminder_time
+
+
+def _chunks(rows, chunk_size):
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# Generate the reports for every user in users_path. Returns (number written, Problems).
+def generate(users_path, output_dir=OUTPUT_DIR, workers=None, chunk_size=CHUNK_SIZE):
+    os.makedirs(output_dir, exist_ok=True)
+    sections = render_sections()
+    problems = Problems()
+    written = 0
+    with open(users_path, newline="", encoding="utf-8") as file:
+        chunks = _chunks(read_users(file, problems), chunk_size)
+        if workers == 1:
+            _init_worker(sections, output_dir)
+            for chunk in chunks:
+                count, chunk_errors = _render_chunk(chunk)
+                written += count
+                problems.extend(chunk_errors)
+            return written, problems
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(sections, output_dir)) as pool:
+            max_in_flight = 2 * (workers or os.cpu_count() or 1)
+            in_flight = set()
+            for chunk in chunks:
+                if len(in_flight) >= max_in_flight:
+                    done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        count, chunk_errors = future.result()
+                        written += count
+                        problems.extend(chunk_errors)
+                in_flight.add(pool.submit(_render_chunk, chunk))
+            for future in in_flight:
+                count, chunk_errors = future.result()
+                written += count
+                problems.extend(chunk_errors)
+    return written, problems
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Write a personalized skincare report for every user in a CSV.")
+    parser.add_argument("users", help="CSV with the columns name, skin_type and optionally reminder_time")
+    parser.add_argument("-o", "--output", default=OUTPUT_DIR, help="folder for the reports (default: %(default)s)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per CPU, 1 = no pool)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="users per work item (default: %(default)s)")
+    args = parser.parse_args(argv)
+    if args.workers is not None and args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    started = time.perf_counter()
+    written, problems = generate(args.users, args.output, args.workers, args.chunk_size)
+    for message in problems.messages:
+        print(message, file=sys.stderr)
+    if problems.count > len(problems.messages):
+        print("... and {} more problems".format(problems.count - len(problems.messages)), file=sys.stderr)
+    print("Wrote {} report(s) to {} in {:.1f} s".format(written, args.output, time.perf_counter() - started))
+    return 1 if problems.count else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,172 @@
+# Module: scoring
+# Description: Questionnaire-based skin type classifier. Each answer rates one of the traits described in the
+#              skin type texts (tightness, shine, T-zone oiliness, reactivity) from 1 (not at all) to 5
+#              (very much). Answers are scaled to 0-1 and compared with a profile for each skin type; the
+#              squared distances to all profiles are computed with one matrix product for the whole batch
+#              and turned into probabilities with a softmax, so the best match and its probability give the
+#              skin type and the confidence.
+#
+#              score_csv() scores a CSV of responses in vectorized chunks instead of one user at a time.
+#
+# Usage: python -m nkahoots.scoring responses.csv [-o results.csv] [--chunk-size N]
+#        The input needs a header row with the trait columns below; an "id" column is copied to the output.
+
+import argparse
+import csv
+from itertools import islice
+import math
+import sys
+
+import numpy as np
+
+# Constants
+TRAITS = ("tightness", "shine", "tzone_oiliness", "reactivity")
+QUESTIONS = {
+    "tightness": "How tight or rough does your skin feel a few hours after washing?",
+    "shine": "How shiny or greasy does your face look by midday?",
+    "tzone_oiliness": "How much oilier is your T-zone (forehead, nose and chin) than your cheeks?",
+    "reactivity": "How easily does your skin sting, redden or itch with new products or weather changes?",
+}
+MIN_ANSWER = 1
+MAX_ANSWER = 5
+TEMPERATURE = 0.1  # lower values make the confidence sharper
+CHUNK_SIZE = 100000
+
+# Expected (0-1 scaled) answers for each skin type, in TRAITS order
+PROFILES = {
+    "Dry": (1.0, 0.0, 0.1, 0.3),
+    "Oily": (0.0, 1.0, 0.8, 0.2),
+    "Combination": (0.5, 0.5, 1.0, 0.2),
+    "Sensitive": (0.4, 0.2, 0.2, 1.0),
+}
+SKIN_TYPES = tuple(PROFILES)
+PROFILE_MATRIX = np.array([PROFILES[skin_type] for skin_type in SKIN_TYPES], dtype=np.float64)
+PROFILE_NORMS = (PROFILE_MATRIX ** 2).sum(axis=1)
+
+
+# Return an (n, number of skin types) array of probabilities for an (n, number of traits) array of answers
+def probabilities(answers):
+    answers = np.asarray(answers, dtype=np.float64)
+    if answers.ndim != 2 or answers.shape[1] != len(TRAITS):
+        raise ValueError("answers must have one column per trait: {}".format(", ".join(TRAITS)))
+    scaled = (np.clip(answers, MIN_ANSWER, MAX_ANSWER) - MIN_ANSWER) / (MAX_ANSWER - MIN_ANSWER)
+    # |x - p|^2 = |x|^2 - 2 x.p + |p|^2 for every answer row and profile at once
+    distances = (scaled ** 2).sum(axis=1)[:, None] - 2.0 * scaled @ PROFILE_MATRIX.T + PROFILE_NORMS[None, :]
+    logits = -distances / TEMPERATURE
+    logits -= logits.max(axis=1, keepdims=True)
+    weights = np.exp(logits)
+    return weights / weights.sum(axis=1, keepdims=True)
+
+
+# Score many questionnaires at once; returns (indices into SKIN_TYPES, confidence) arrays
+def score_batch(answers):
+    probs = probabilities(answers)
+    best = probs.argmax(axis=1)
+    return best, probs[np.arange(len(best)), best]
+
+
+# Score one questionnaire given as {trait: answer}; returns (skin type, confidence)
+def score_answers(answers):
+    row = [[answers[trait] for trait in TRAITS]]
+    best, confidence = score_batch(row)
+    return SKIN_TYPES[best[0]], float(confidence[0])
+
+
+def _print_error(line_number, message):
+    print("line {}: {}".format(line_number, message), file=sys.stderr)
+
+
+# Read up to chunk_size valid rows from a csv reader as (ids, answers array). Rows that cannot be scored are
+# passed to report_error(line number, message) and skipped; blank lines are skipped silently.
+def _read_chunk(reader, chunk_size, trait_columns, id_column, report_error):
+    ids = []
+    answers = np.empty((chunk_size, len(TRAITS)), dtype=np.float64)
+    count = 0
+    for row in islice(reader, chunk_size):
+        if not any(field.strip() for field in row):
+            continue
+        try:
+            values = [float(row[column]) for column in trait_columns]
+        except IndexError:
+            report_error(reader.line_num, "expected at least {} fields, got {}".format(max(trait_columns) + 1, len(row)))
+            continue
+        except ValueError:
+            report_error(reader.line_num, "answers must be numbers: {}".format(
+                ", ".join(repr(row[column]) for column in trait_columns)))
+            continue
+        if not all(math.isfinite(value) for value in values):
+            report_error(reader.line_num, "answers must be finite numbers")
+            continue
+        answers[count] = values
+        count += 1
+        if id_column is not None:
+            ids.append(row[id_column] if id_column < len(row) else "")
+    return ids, answers[:count]
+
+
+# Score every row of input_file (an open text file with a header) and write id, skin_type and confidence
+# rows to output_file. Rows are parsed with the csv module and scored chunk_size at a time. Rows that cannot
+# be scored are reported with their line number through report_error(line number, message) (standard error
+# by default) and skipped. Without an "id" column the rows are numbered in the order they were scored.
+# Returns the number of rows scored.
+def score_csv(input_file, output_file, chunk_size=CHUNK_SIZE, report_error=_print_error):
+    reader = csv.reader(input_file)
+    header = next(reader, None)
+    if header is None:
+        raise ValueError("the input is empty")
+    columns = [name.strip().lower() for name in header]
+    missing = [trait for trait in TRAITS if trait not in columns]
+    if missing:
+        raise ValueError("missing column(s): {}".format(", ".join(missing)))
+    trait_columns = [columns.index(trait) for trait in TRAITS]
+    id_column = columns.index("id") if "id" in columns else None
+
+    writer = csv.writer(output_file, lineterminator="\n")
+    writer.writerow(["id", "skin_type", "confidence"])
+    labels = np.array(SKIN_TYPES)
+    total = 0
+    while True:
+        line_before = reader.line_num
+        ids, answers = _read_chunk(reader, chunk_size, trait_columns, id_column, report_error)
+        if reader.line_num == line_before:
+            break
+        if not len(answers):
+            continue
+        if id_column is None:
+            ids = [str(number) for number in range(total + 1, total + len(answers) + 1)]
+        best, confidence = score_batch(answers)
+        writer.writerows(zip(ids, labels[best].tolist(), np.round(confidence, 4).tolist()))
+        total += len(answers)
+    return total
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score skin type questionnaires from a CSV file.")
+    parser.add_argument("responses", help="CSV with a header and the columns: " + ", ".join(TRAITS))
+    parser.add_argument("-o", "--output", help="where to write the results (default: standard output)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE, help="rows scored per batch")
+    args = parser.parse_args(argv)
+    if args.chunk_size < 1:
+        parser.error("--chunk-size must be at least 1")
+
+    skipped = 0
+
+    def report_error(line_number, message):
+        nonlocal skipped
+        skipped += 1
+        _print_error(line_number, message)
+
+    with open(args.responses, newline="") as input_file:
+        if args.output:
+            with open(args.output, "w", newline="") as output_file:
+                count = score_csv(input_file, output_file, args.chunk_size, report_error)
+            print(f"Scored {count} responses into {args.output}", file=sys.stderr)
+        else:
+            score_csv(input_file, sys.stdout, args.chunk_size, report_error)
+    if skipped:
+        print(f"Skipped {skipped} row(s) that could not be scored", file=sys.stderr)
+    return 1 if skipped else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+# Module: server
+# Description: Local HTTP API serving the same content as the Beauty Bot windows, built on asyncio streams so
+#              one process on one core can keep thousands of connections open.
+#
+#              Every GET response is built once at startup: the JSON body, its ETag and a gzip copy. A request
+#              with a matching If-None-Match gets 304 Not Modified, and clients that accept gzip get the
+#              compressed copy. Thumbnails are held in memory, taken from the prebuilt atlas when there is
+#              one (python -m nkahoots.assets) and encoded once with PIL otherwise.
+#
+#              Reminders registered through the API use the same heap scheduler as the GUI, with its timer
+#              driven by the asyncio event loop instead of Tk. Fired reminders are logged and can be read
+#              back from /reminders/fired. The server keeps its own event log (api_events.csv) because the
+#              GUI's writer buffers and rotates application_dates.csv on its own, and two processes
+#              appending to one file could interleave partial lines or rotate it under each other.
+#
+#              GET    /skin-types                  skin types with a short description
+#              GET    /skin-types/<type>           description, schedule, tips, best times and products
+#              GET    /thumbnails/<image name>     product thumbnail
+#              GET    /reminders                   pending reminders
+#              POST   /reminders                   {"skin_type": "Dry", "time": "08:30"} (daily from the next 08:30)
+#              DELETE /reminders/<id>              cancel a reminder
+#              GET    /reminders/fired             the most recently fired reminders
+#
+# Usage: python -m nkahoots.server [--host 127.0.0.1] [--port 8080]
+
+import argparse
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+import gzip
+import hashlib
+import io
+import json
+import os
+import re
+import signal
+from urllib.parse import unquote
+
+from nkahoots.assets import IMAGE_DIR, THUMBNAIL_SIZE, get_atlas
+from nkahoots.catalog import get_catalog
+from nkahoots.data import best_times, button_data, skin_data
+from nkahoots.event_log import EventLog
+from nkahoots.reminders import ReminderScheduler
+
+# Constants
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 8080
+FOLDER = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+STORE_PATH = os.path.join(FOLDER, "api_reminders.json")
+LOG_PATH = os.path.join(FOLDER, "api_events.csv")
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 16 * 1024
+KEEP_ALIVE_SECONDS = 30
+FIRED_HISTORY = 100
+GZIP_MIN_BYTES = 256  # smaller bodies are not worth compressing
+TIME_PATTERN = re.compile(r"^(\d{1,2}):(\d{2})$")
+
+STATUS_TEXT = {
+    200: "OK", 201: "Created", 304: "Not Modified", 400: "Bad Request", 404: "Not Found",
+    405: "Method Not Allowed", 413: "Payload Too Large", 501: "Not Implemented",
+}
+
+
+class Response:
+    __slots__ = ("status", "body", "content_type", "etag", "gzip_body")
+
+    def __init__(self, status, body, content_type="application/json", cacheable=False):
+        self.status = status
+        self.body = body
+        self.content_type = content_type
+        self.etag = None
+        self.gzip_body = None
+        if cacheable:
+            self.etag = '"{}"'.format(hashlib.sha1(body).hexdigest()[:20])
+            if len(body) >= GZIP_MIN_BYTES and content_type.startswith(("application/json", "text/")):
+                compressed = gzip.compress(body, compresslevel=9, mtime=0)
+                if len(compressed) < len(body):
+                    self.gzip_body = compressed
+
+
+def json_response(data, status=200, cacheable=False):
+    return Response(status, json.dumps(data, ensure_ascii=False).encode("utf-8"), "application/json; charset=utf-8",
+                    cacheable)
+
+
+def error_response(status, message):
+    return json_response({"error": message}, status)
+
+
+# The thumbnail bytes and content type for an image, encoded once at startup
+def load_thumbnail(image_name):
+    atlas = get_atlas()
+    if atlas is not None and image_name in atlas:
+        content_type = "image/png" if atlas.format == "png" else "image/x-portable-pixmap"
+        return bytes(atlas.get_bytes(image_name)), content_type
+    from PIL import Image
+
+    try:
+        with Image.open(os.path.join(IMAGE_DIR, image_name)) as image:
+            thumbnail = image.convert("RGB").resize(THUMBNAIL_SIZE)
+    except FileNotFoundError:
+        return None
+    except OSError as error:
+        # A corrupt image only loses its thumbnail; the rest of the API still starts
+        print(f"Could not read image {image_name}: {error}")
+        return None
+    output = io.BytesIO()
+    thumbnail.save(output, format="JPEG", quality=85)
+    return output.getvalue(), "image/jpeg"
+
+
+# Build every static response once
+def build_static_responses():
+    responses = {}
+    summaries = dict(button_data)
+    responses["/skin-types"] = json_response(
+        [{"skin_type": skin_type, "summary": summaries.get(skin_type, ""), "url": "/skin-types/" + skin_type}
+         for skin_type in skin_data], cacheable=True)
+
+    catalog = get_catalog()
+    for skin_type, data in skin_data.items():
+        products = []
+        for product in catalog.by_skin_type(skin_type):
+            products.append({
+                "name": product.name,
+                "description": product.full_description(),
+                "ingredients": list(product.ingredients),
+                "thumbnail": "/thumbnails/" + product.image if product.image else None,
+            })
+        responses["/skin-types/" + skin_type] = json_response({
+            "skin_type": skin_type,
+            "description": data["description"],
+            "best_times": best_times[skin_type],
+            "schedule": data["schedule"],
+            "tips": data["tips"],
+            "products": products,
+        }, cacheable=True)
+        # Skin types are also found in lower case
+        responses["/skin-types/" + skin_type.lower()] = responses["/skin-types/" + skin_type]
+
+    # Every image a product links to, the same set the thumbnail atlas is built from
+    image_names = dict.fromkeys(product.image for product in catalog.products if product.image)
+    for image_name in image_names:
+        thumbnail = load_thumbnail(image_name)
+        if thumbnail is not None:
+            responses["/thumbnails/" + image_name] = Response(200, thumbnail[0], thumbnail[1], cacheable=True)
+    return responses
+
+
+# Gives ReminderScheduler the after()/after_cancel() interface it uses on the Tk root
+class LoopTimer:
+    def __init__(self, loop):
+        self.loop = loop
+
+    def after(self, delay_ms, callback):
+        return self.loop.call_later(delay_ms / 1000, callback)
+
+    def after_cancel(self, handle):
+        handle.cancel()
+
+
+class ApiServer:
+    def __init__(self, store_path=STORE_PATH, event_log=None):
+        self.static = build_static_responses()
+        self.store_path = store_path
+        self.event_log = event_log or EventLog(LOG_PATH)
+        self.fired = deque(maxlen=FIRED_HISTORY)
+        self.scheduler = None
+        self.connections = 0
+
+    async def start(self, host=DEFAULT_HOST, port=DEFAULT_PORT, backlog=4096):
+        self.scheduler = ReminderScheduler(LoopTimer(asyncio.get_running_loop()), self._on_reminder, self.store_path)
+        self.scheduler.start()
+        return await asyncio.start_server(self._handle_connection, host, port, backlog=backlog,
+                                          limit=MAX_HEADER_BYTES)
+
+    def close(self):
+        if self.scheduler is not None:
+            self.scheduler.shutdown()
+        self.event_log.close()
+
+    def _on_reminder(self, reminder):
+        self.event_log.log("reminder_fired", reminder.skin_type)
+        self.fired.append({
+            "id": reminder.reminder_id,
+            "skin_type": reminder.skin_type,
+            "fired_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            "message": "Consistency is key for healthy, glowing skin! You're one day closer to turning your "
+                       "{} skin into healthier, radiant skin!".format(reminder.skin_type),
+        })
+
+    async def _handle_connection(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                try:
+                    head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), KEEP_ALIVE_SECONDS)
+                except (asyncio.IncompleteReadError, asyncio.TimeoutError, ConnectionError):
+                    return
+                except asyncio.LimitOverrunError:
+                    await self._send(writer, error_response(400, "request headers too large"), {}, close=True)
+                    return
+
+                lines = head.decode("latin-1").split("\r\n")
+                parts = lines[0].split(" ")
+                if len(parts) != 3:
+                    await self._send(writer, error_response(400, "malformed request line"), {}, close=True)
+                    return
+                method, target, version = parts
+                headers = {}
+                for line in lines[1:]:
+                    name, _, value = line.partition(":")
+                    if name:
+                        headers[name.strip().lower()] = value.strip()
+
+                if "transfer-encoding" in headers:
+                    # Only Content-Length bodies are read; a chunked body would be taken for the next request
+                    await self._send(writer, error_response(501, "chunked request bodies are not supported, "
+                                                                 "send Content-Length"), headers, close=True)
+                    return
+
+                body = b""
+                length = headers.get("content-length")
+                if length:
+                    if not length.isdigit() or int(length) > MAX_BODY_BYTES:
+                        await self._send(writer, error_response(413, "request body too large"), headers, close=True)
+                        return
+                    try:
+                        body = await reader.readexactly(int(length))
+                    except (asyncio.IncompleteReadError, ConnectionError):
+                        return
+
+                connection = headers.get("connection", "").lower()
+                close = connection == "close" or (version == "HTTP/1.0" and connection != "keep-alive")
+                response = self.route(method, target.split("?", 1)[0], body)
+                await self._send(writer, response, headers, close=close, head_only=method == "HEAD")
+                if close:
+                    return
+        finally:
+            self.connections -= 1
+            writer.close()
+
+    async def _send(self, writer, response, headers, close=False, head_only=False):
+        status = response.status
+        body = response.body
+        extra = []
+        if response.etag is not None:
+            extra.append("ETag: " + response.etag)
+            extra.append("Cache-Control: no-cache")
+            if headers.get("if-none-match") in (response.etag, "*"):
+                status = 304
+                body = b""
+            elif response.gzip_body is not None:
+                extra.append("Vary: Accept-Encoding")
+                if "gzip" in headers.get("accept-encoding", ""):
+                    body = response.gzip_body
+                    extra.append("Content-Encoding: gzip")
+        lines = ["HTTP/1.1 {} {}".format(status, STATUS_TEXT.get(status, "")),
+                 "Content-Type: " + response.content_type,
+                 "Content-Length: {}".format(len(body)),
+                 "Connection: " + ("close" if close else "keep-alive")] + extra
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (b"" if head_only else body))
+        try:
+            await writer.drain()
+        except ConnectionError:
+            pass
+
+    def route(self, method, path, body):
+        path = unquote(path).rstrip("/") or "/"
+        if method in ("GET", "HEAD"):
+            response = self.static.get(path)
+            if response is not None:
+                return response
+        if path == "/reminders":
+            if method in ("GET", "HEAD"):
+                return json_response([self._reminder_json(reminder) for reminder in self.scheduler.pending()])
+            if method == "POST":
+                return self._add_reminder(body)
+            return error_response(405, "use GET or POST")
+        if path == "/reminders/fired":
+            if method not in ("GET", "HEAD"):
+                return error_response(405, "use GET")
+            return json_response(list(self.fired))
+        if path.startswith("/reminders/"):
+            if method != "DELETE":
+                return error_response(405, "use DELETE")
+            reminder_id = path[len("/reminders/"):]
+            if reminder_id.isdigit() and self.scheduler.cancel(int(reminder_id)):
+                return json_response({"cancelled": int(reminder_id)})
+            return error_response(404, "no such reminder")
+        if method not in ("GET", "HEAD"):
+            return error_response(405, "method not allowed")
+        return error_response(404, "not found")
+
+    def _add_reminder(self, body):
+        try:
+            data = json.loads(body or b"{}")
+            skin_type = {name.lower(): name for name in skin_data}.get(str(data.get("skin_type", "")).lower())
+            match = TIME_PATTERN.match(str(data.get("time", "")))
+        except (ValueError, AttributeError):
+            return error_response(400, "body must be a JSON object")
+        if skin_type is None:
+            return error_response(400, "skin_type must be one of: " + ", ".join(skin_data))
+        if match is None or int(match.group(1)) > 23 or int(match.group(2)) > 59:
+            return error_response(400, "time must be HH:MM (24-hour clock)")
+
+        now = datetime.now()
+        due = now.replace(hour=int(match.group(1)), minute=int(match.group(2)), second=0, microsecond=0)
+        if due <= now:
+            due += timedelta(days=1)
+        reminder = self.scheduler.add(skin_type, due)
+        self.event_log.log("reminder_set", skin_type)
+        return json_response(self._reminder_json(reminder), status=201)
+
+    @staticmethod
+    def _reminder_json(reminder):
+        return {"id": reminder.reminder_id, "skin_type": reminder.skin_type,
+                "next": reminder.due.strftime("%Y-%m-%d %H:%M:%S"), "repeat": reminder.repeat}
+
+
+async def serve(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    api = ApiServer()
+    server = await api.start(host, port)
+    print("Serving the N'Kahoots API on http://{}:{}".format(host, port), flush=True)
+    # Stop cleanly on SIGTERM too, so pending reminder changes and the usage log are written
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, server.close)
+    except (NotImplementedError, AttributeError):
+        pass
+    try:
+        async with server:
+            await server.serve_forever()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        api.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the N'Kahoots skin type content over HTTP.")
+    parser.add_argument("--host", default=DEFAULT_HOST, help="address to listen on (default: %(default)s)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="port to listen on (default: %(default)s)")
+    args = parser.parse_args(argv)
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
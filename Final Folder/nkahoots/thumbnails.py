@@ -0,0 +1,152 @@
+# Module: thumbnails
+# Description: Two-layer cache for the product thumbnails shown in the product window.
+#              Layer 1 keeps decoded, resized images in memory (least recently used entries are dropped
+#              once the byte budget is exceeded). Layer 2 keeps pre-resized PNG copies on disk, keyed by
+#              the source path, its modification time and the target size, so a cold start can skip
+#              the JPEG decode and the resampling step. PIL is imported on first use.
+
+from collections import OrderedDict
+import hashlib
+import os
+import threading
+import time
+
+from nkahoots.instrument import record, span
+
+# Constants
+CACHE_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".thumbnail_cache")
+MEMORY_BUDGET_BYTES = 16 * 1024 * 1024
+DISK_BUDGET_BYTES = 64 * 1024 * 1024
+
+
+class ThumbnailCache:
+    def __init__(self, cache_dir=CACHE_DIR, memory_budget=MEMORY_BUDGET_BYTES, disk_budget=DISK_BUDGET_BYTES):
+        self.cache_dir = cache_dir
+        self.memory_budget = memory_budget
+        self.disk_budget = disk_budget
+        self._entries = OrderedDict()  # key -> (image, size in bytes)
+        self._memory_bytes = 0
+        # The cache is shared by the image worker threads, so the in-memory layer is guarded by a lock.
+        # Decoding and resizing happen outside the lock so workers still run in parallel.
+        self._lock = threading.Lock()
+        # Hit/miss counters for each layer, see stats()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    # Build the cache key from the source path, its modification time and the target size
+    def _key(self, image_path, size):
+        mtime_ns = os.stat(image_path).st_mtime_ns
+        raw = "{}|{}|{}x{}".format(os.path.abspath(image_path), mtime_ns, size[0], size[1])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+    # Return the thumbnail for image_path resized to size, using the fastest layer that has it.
+    # Raises FileNotFoundError when the source image does not exist.
+    def get(self, image_path, size=(150, 150)):
+        key = self._key(image_path, size)
+
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.memory_hits += 1
+                return entry[0]
+
+        image = self._load_from_disk(key)
+        if image is not None:
+            with self._lock:
+                self.disk_hits += 1
+        else:
+            with self._lock:
+                self.misses += 1
+            from PIL import Image
+            with span("thumbnail.decode_resize"):
+                image = Image.open(image_path)
+                image = image.resize(size)
+            self._save_to_disk(key, image)
+
+        self._remember(key, image)
+        return image
+
+    # Keep an image in memory and drop the least recently used ones when over budget
+    def _remember(self, key, image):
+        nbytes = image.width * image.height * len(image.getbands())
+        if nbytes > self.memory_budget:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._memory_bytes -= previous[1]
+            self._entries[key] = (image, nbytes)
+            self._memory_bytes += nbytes
+            while self._memory_bytes > self.memory_budget:
+                _, (_, dropped) = self._entries.popitem(last=False)
+                self._memory_bytes -= dropped
+
+    def _disk_path(self, key):
+        return os.path.join(self.cache_dir, key + ".png")
+
+    def _load_from_disk(self, key):
+        from PIL import Image
+        started = time.perf_counter()
+        try:
+            image = Image.open(self._disk_path(key))
+            image.load()
+        except (OSError, ValueError):
+            # Missing or unreadable cache file, fall back to the source image
+            return None
+        # Only successful loads are timed; a miss would otherwise count as a very fast disk load
+        record("thumbnail.disk_load", (time.perf_counter() - started) * 1000)
+        return image
+
+    def _save_to_disk(self, key, image):
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self._disk_path(key)
+            # Write to a temporary file first so a crash never leaves a half-written thumbnail behind
+            temp_path = "{}.{}.tmp".format(path, threading.get_ident())
+            image.save(temp_path, format="PNG")
+            os.replace(temp_path, path)
+            self._trim_disk()
+        except OSError as error:
+            print(f"Could not write thumbnail cache: {error}")
+
+    # Remove the oldest cached thumbnails until the disk cache is back under its budget
+    def _trim_disk(self):
+        files = []
+        total = 0
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".png"):
+                info = entry.stat()
+                files.append((info.st_mtime, info.st_size, entry.path))
+                total += info.st_size
+        files.sort()
+        for _, file_size, path in files:
+            if total <= self.disk_budget:
+                break
+            try:
+                os.remove(path)
+                total -= file_size
+            except OSError:
+                pass
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
+            self._memory_bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.memory_hits + self.disk_hits) / lookups if lookups else 0.0,
+                "memory_entries": len(self._entries),
+                "memory_bytes": self._memory_bytes,
+            }
+
+
+# Shared cache used by the GUI
+thumbnail_cache = ThumbnailCache()
@@ -0,0 +1,276 @@
+# Module: usage_report
+# Description: Usage analytics over application_dates.csv: launches per day, per hour of day and per
+#              weekday, plus the gaps between sessions. The log is read once, in chunks, and a checkpoint
+#              (byte offset reached, running totals and the last launch time) is saved next to it, so the
+#              next report only reads the rows appended since.
+#
+#              If the log has been rotated (a different file now sits at the path), the rest of the file the
+#              checkpoint points at is read from its rotated copy (<name>.<YYYY-MM-DD>.<n>.csv), then any
+#              later rotated files and the new file from the start, so the totals carry on. If the file got
+#              shorter or its first line changed, the checkpoint no longer matches and the report starts
+#              over. A report without a checkpoint (or with --reset) reads the rotated files first.
+#
+# Usage: python -m nkahoots.usage_report [--log PATH] [--checkpoint PATH] [--reset] [--json]
+
+import argparse
+from collections import Counter
+from datetime import date
+import hashlib
+import json
+import os
+import re
+
+from nkahoots.event_log import EVENT_NAMES, LOG_PATH
+
+# Constants
+CHECKPOINT_PATH = os.path.join(os.path.dirname(LOG_PATH), "usage_report.checkpoint.json")
+CHUNK_SIZE = 1024 * 1024
+FINGERPRINT_BYTES = 64
+WEEKDAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+# Session gap buckets: (label, upper bound in seconds)
+GAP_BUCKETS = [("under 1 hour", 3600), ("1 hour to 1 day", 86400), ("1 to 7 days", 7 * 86400), ("over 7 days", None)]
+
+
+class UsageStats:
+    def __init__(self):
+        self.launches = 0
+        self.per_day = Counter()
+        self.per_hour = [0] * 24
+        self.per_weekday = [0] * 7
+        self.events = Counter()
+        self.gap_count = 0
+        self.gap_total = 0
+        self.gap_min = None
+        self.gap_max = None
+        self.gap_buckets = [0] * len(GAP_BUCKETS)
+        self.last_launch = None  # seconds since 0001-01-01 local time, see _parse_seconds()
+        self._weekday_cache = {}
+
+    # Add one log line (bytes, without the newline)
+    def add_line(self, line):
+        if len(line) < 19:
+            return
+        # Lines written by the event log have ",<code>" after the timestamp, older lines are bare launches
+        if len(line) > 20 and line[19:20] == b",":
+            code = line[20:21].decode("ascii", "replace")
+        else:
+            code = "L"
+        self.events[EVENT_NAMES.get(code, code)] += 1
+        if code != "L":
+            return
+        try:
+            day_text = line[:10].decode("ascii")
+            hour, minute, second = int(line[11:13]), int(line[14:16]), int(line[17:19])
+            if not (0 <= hour <= 23 and 0 <= minute <= 59 and 0 <= second <= 59):
+                return
+            seconds = self._parse_seconds(day_text, hour, minute, second)
+        except ValueError:
+            return
+
+        self.launches += 1
+        self.per_day[day_text] += 1
+        self.per_hour[hour] += 1
+        self.per_weekday[self._weekday_cache[day_text][1]] += 1
+
+        if self.last_launch is not None:
+            self._add_gap(seconds - self.last_launch)
+        self.last_launch = seconds
+
+    # Timestamps are turned into plain seconds from the date ordinal; this avoids strptime for every row
+    def _parse_seconds(self, day_text, hour, minute, second):
+        cached = self._weekday_cache.get(day_text)
+        if cached is None:
+            day = date(int(day_text[0:4]), int(day_text[5:7]), int(day_text[8:10]))
+            cached = (day.toordinal(), day.weekday())
+            self._weekday_cache[day_text] = cached
+        return cached[0] * 86400 + hour * 3600 + minute * 60 + second
+
+    def _add_gap(self, gap):
+        if gap < 0:
+            return
+        self.gap_count += 1
+        self.gap_total += gap
+        self.gap_min = gap if self.gap_min is None else min(self.gap_min, gap)
+        self.gap_max = gap if self.gap_max is None else max(self.gap_max, gap)
+        for index, (_, upper) in enumerate(GAP_BUCKETS):
+            if upper is None or gap < upper:
+                self.gap_buckets[index] += 1
+                break
+
+    def to_dict(self):
+        return {
+            "launches": self.launches,
+            "per_day": dict(sorted(self.per_day.items())),
+            "per_hour": self.per_hour,
+            "per_weekday": self.per_weekday,
+            "events": dict(self.events),
+            "gap_count": self.gap_count,
+            "gap_total": self.gap_total,
+            "gap_min": self.gap_min,
+            "gap_max": self.gap_max,
+            "gap_buckets": self.gap_buckets,
+            "last_launch": self.last_launch,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        stats = cls()
+        stats.launches = data["launches"]
+        stats.per_day = Counter(data["per_day"])
+        stats.per_hour = list(data["per_hour"])
+        stats.per_weekday = list(data["per_weekday"])
+        stats.events = Counter(data["events"])
+        stats.gap_count = data["gap_count"]
+        stats.gap_total = data["gap_total"]
+        stats.gap_min = data["gap_min"]
+        stats.gap_max = data["gap_max"]
+        stats.gap_buckets = list(data["gap_buckets"])
+        stats.last_launch = data["last_launch"]
+        return stats
+
+
+# Identify the file at path so a rotated or rewritten log can be told apart from a grown one
+def _file_identity(path):
+    info = os.stat(path)
+    with open(path, "rb") as file:
+        fingerprint = hashlib.sha1(file.read(FINGERPRINT_BYTES)).hexdigest()
+    return {"device": info.st_dev, "inode": info.st_ino, "size": info.st_size, "fingerprint": fingerprint}
+
+
+def load_checkpoint(checkpoint_path):
+    try:
+        with open(checkpoint_path) as file:
+            data = json.load(file)
+        return data["file"], data["offset"], UsageStats.from_dict(data["stats"])
+    except FileNotFoundError:
+        return None, 0, UsageStats()
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Ignoring unreadable checkpoint {checkpoint_path}: {error}")
+        return None, 0, UsageStats()
+
+
+def save_checkpoint(checkpoint_path, identity, offset, stats):
+    data = {"file": identity, "offset": offset, "stats": stats.to_dict()}
+    temp_path = checkpoint_path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(data, file)
+    os.replace(temp_path, checkpoint_path)
+
+
+# Rotated copies of the log (see EventLog._rotate), oldest first
+def rotated_logs(log_path):
+    folder = os.path.dirname(log_path) or "."
+    stem, extension = os.path.splitext(os.path.basename(log_path))
+    pattern = re.compile(r"^{}\.(\d{{4}}-\d{{2}}-\d{{2}})\.(\d+){}$".format(re.escape(stem), re.escape(extension)))
+    found = []
+    for file_name in os.listdir(folder):
+        match = pattern.match(file_name)
+        if match:
+            found.append((match.group(1), int(match.group(2)), os.path.join(folder, file_name)))
+    return [path for _, _, path in sorted(found)]
+
+
+# Add the complete lines of the file at path from offset on and return the offset reached. The last line
+# of a finished (rotated) file is counted even without a newline; in the live file it may still be written.
+def _read_lines(path, offset, stats, finished=False):
+    with open(path, "rb") as file:
+        file.seek(offset)
+        pending = b""
+        while True:
+            chunk = file.read(CHUNK_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b"\n")
+            # The last piece may be a row that is still being written; keep it for the next chunk/run
+            pending = lines.pop()
+            for line in lines:
+                stats.add_line(line.rstrip(b"\r"))
+                offset += len(line) + 1
+    if finished and pending:
+        stats.add_line(pending.rstrip(b"\r"))
+        offset += len(pending)
+    return offset
+
+
+# Bring the statistics up to date with the log and return them. Only bytes after the checkpoint are read.
+def update(log_path=LOG_PATH, checkpoint_path=CHECKPOINT_PATH, reset=False):
+    saved_identity, offset, stats = (None, 0, UsageStats()) if reset else load_checkpoint(checkpoint_path)
+    rotated = rotated_logs(log_path)
+    if saved_identity is None:
+        # No checkpoint: everything that was rotated away comes first
+        for path in rotated:
+            _read_lines(path, 0, stats, finished=True)
+    else:
+        saved_file = (saved_identity["device"], saved_identity["inode"])
+        identity = _file_identity(log_path) if os.path.exists(log_path) else None
+        if identity is None or saved_file != (identity["device"], identity["inode"]):
+            # Log was rotated: finish the file the checkpoint points at, then read every later file in full
+            for index, path in enumerate(rotated):
+                info = os.stat(path)
+                if (info.st_dev, info.st_ino) == saved_file and info.st_size >= offset:
+                    _read_lines(path, offset, stats, finished=True)
+                    for later_path in rotated[index + 1:]:
+                        _read_lines(later_path, 0, stats, finished=True)
+                    break
+            offset = 0
+        elif identity["size"] < offset or (offset >= FINGERPRINT_BYTES and
+                                           identity["fingerprint"] != saved_identity["fingerprint"]):
+            # Same file but truncated or rewritten, start over
+            offset = 0
+            stats = UsageStats()
+    if not os.path.exists(log_path):
+        return stats
+
+    offset = _read_lines(log_path, offset, stats)
+
+    # Fingerprint again now that the rows read so far are known to be in the file
+    identity = _file_identity(log_path)
+    identity["size"] = offset
+    save_checkpoint(checkpoint_path, identity, offset, stats)
+    return stats
+
+
+def format_report(stats):
+    lines = ["Launches: {}".format(stats.launches), "", "Launches per day:"]
+    for day, count in sorted(stats.per_day.items()):
+        lines.append("  {}  {}".format(day, count))
+    lines += ["", "Launches per hour of day:"]
+    for hour, count in enumerate(stats.per_hour):
+        if count:
+            lines.append("  {:02d}:00  {}".format(hour, count))
+    lines += ["", "Launches per weekday:"]
+    for weekday, count in zip(WEEKDAYS, stats.per_weekday):
+        lines.append("  {:<9}  {}".format(weekday, count))
+    lines += ["", "Session gaps:"]
+    if stats.gap_count:
+        lines.append("  average {:.1f} min, shortest {:.1f} min, longest {:.1f} h".format(
+            stats.gap_total / stats.gap_count / 60, stats.gap_min / 60, stats.gap_max / 3600))
+        for (label, _), count in zip(GAP_BUCKETS, stats.gap_buckets):
+            lines.append("  {:<16} {}".format(label, count))
+    else:
+        lines.append("  not enough launches yet")
+    other_events = {name: count for name, count in stats.events.items() if name != "launch"}
+    if other_events:
+        lines += ["", "Other events:"]
+        for name, count in sorted(other_events.items()):
+            lines.append("  {:<17} {}".format(name, count))
+    return "\n".join(lines)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Usage report for the N'Kahoots Beauty Bot.")
+    parser.add_argument("--log", default=LOG_PATH, help="usage log to read (default: %(default)s)")
+    parser.add_argument("--checkpoint", default=CHECKPOINT_PATH, help="checkpoint file (default: %(default)s)")
+    parser.add_argument("--reset", action="store_true", help="ignore the checkpoint and read the whole log, rotated files included")
+    parser.add_argument("--json", action="store_true", help="print the statistics as JSON")
+    args = parser.parse_args(argv)
+
+    stats = update(args.log, args.checkpoint, reset=args.reset)
+    if args.json:
+        print(json.dumps(stats.to_dict(), indent=2))
+    else:
+        print(format_report(stats))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+# Module: widgets
+# Description: Reusable tkinter widgets for the Beauty Bot windows.
+#
+#              VirtualList shows a long list of items with fixed-height rows inside a scrollable Canvas but
+#              only creates widgets for the rows that fit on screen (plus one). When the list is scrolled
+#              the same row widgets are moved and filled with the items that became visible, so the widget
+#              count and memory stay the same whether the list has ten items or ten thousand.
+
+import tkinter as tk
+
+
+class VirtualList(tk.Frame):
+    # create_row(parent) builds the widgets of one row and returns an object describing them;
+    # fill_row(row, item) shows `item` in an existing row.
+    def __init__(self, parent, row_height, create_row, fill_row, visible_rows=3, width=520, **kwargs):
+        super().__init__(parent, **kwargs)
+        self.row_height = row_height
+        self.create_row = create_row
+        self.fill_row = fill_row
+        self.items = []
+        self.canvas = tk.Canvas(self, width=width, height=row_height * visible_rows, highlightthickness=0,
+                                yscrollincrement=20)
+        self.scrollbar = tk.Scrollbar(self, orient=tk.VERTICAL, command=self.canvas.yview)
+        self.canvas.configure(yscrollcommand=self._on_scroll)
+        self.scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.canvas.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self._rows = []  # [frame, canvas window id, row object, index of the item it shows]
+        self.canvas.bind("<Configure>", lambda event: self._layout())
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(sequence, self._on_wheel)
+
+    def set_items(self, items):
+        self.items = list(items)
+        self.canvas.configure(scrollregion=(0, 0, 0, len(self.items) * self.row_height))
+        self.canvas.yview_moveto(0)
+        for row in self._rows:
+            row[3] = None
+        self._layout()
+
+    # Number of row widgets needed to cover the visible area, including a partly visible row at each end
+    def _pool_size(self):
+        height = max(self.canvas.winfo_height(), int(self.canvas.cget("height")))
+        return min(len(self.items), height // self.row_height + 2)
+
+    def _on_scroll(self, first, last):
+        self.scrollbar.set(first, last)
+        self._layout()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.canvas.yview_scroll(-1, "units")
+        else:
+            self.canvas.yview_scroll(1, "units")
+
+    def _add_row(self):
+        frame = tk.Frame(self.canvas, height=self.row_height)
+        frame.pack_propagate(False)
+        window_id = self.canvas.create_window(0, 0, window=frame, anchor=tk.NW, height=self.row_height)
+        row = self.create_row(frame)
+        self._bind_wheel(frame)
+        self._rows.append([frame, window_id, row, None])
+
+    # Scroll the list when the wheel is used anywhere over a row, not only over the bare canvas
+    def _bind_wheel(self, widget):
+        for sequence in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            widget.bind(sequence, self._on_wheel)
+        for child in widget.winfo_children():
+            self._bind_wheel(child)
+
+    # Fill every visible row again, e.g. after the images they were waiting for were dropped
+    def refresh(self):
+        for row in self._rows:
+            row[3] = None
+        self._layout()
+
+    # Move the pooled rows to the visible part of the list and refill the ones whose item changed.
+    # Item i always goes to row i % pool size, so scrolling by one row only refills one row.
+    def _layout(self):
+        while len(self._rows) < self._pool_size():
+            self._add_row()
+        pool_size = len(self._rows)
+        if not pool_size:
+            return
+        width = self.canvas.winfo_width()
+        first = max(0, int(self.canvas.canvasy(0)) // self.row_height)
+        for index in range(first, first + pool_size):
+            row = self._rows[index % pool_size]
+            frame, window_id, row_widgets, shown = row
+            if index >= len(self.items):
+                self.canvas.itemconfigure(window_id, state=tk.HIDDEN)
+                row[3] = None
+                continue
+            self.canvas.itemconfigure(window_id, state=tk.NORMAL, width=max(width, 1))
+            self.canvas.coords(window_id, 0, index * self.row_height)
+            if shown != index:
+                self.fill_row(row_widgets, self.items[index])
+                row[3] = index
@@ -0,0 +1,37 @@
+# Tests for catalog lookups and search
+
+from nkahoots.catalog import Catalog, Product
+
+
+def make_catalog():
+    return Catalog([
+        Product(0, "Dry", "Rich Cream", "dry.jpg", ("shea butter",), "A thick cream for the driest skin."),
+        Product(1, "Sensitive", "Rich Cream", "sensitive.jpg", ("oat",), "A calming cream without fragrance."),
+        Product(2, "Oily", "Clear Gel", "oily.jpg", ("zinc",), "A light gel that controls shine."),
+    ])
+
+
+def test_stop_word_query_matches_nothing():
+    catalog = make_catalog()
+    assert catalog.search("the") == []
+    assert catalog.search("the a of") == []
+    assert catalog.search("the", skin_type="Dry") == []
+
+
+def test_empty_query_only_applies_filters():
+    catalog = make_catalog()
+    assert len(catalog.search("")) == 3
+    assert [product.name for product in catalog.search("", skin_type="Oily")] == ["Clear Gel"]
+
+
+def test_search_ignores_stop_words_next_to_real_words():
+    catalog = make_catalog()
+    assert [product.product_id for product in catalog.search("the cream")] == [0, 1]
+
+
+def test_by_name_keeps_products_sharing_a_name():
+    catalog = make_catalog()
+    assert catalog.by_name("rich cream").skin_type == "Dry"
+    assert catalog.by_name("Rich Cream", skin_type="Sensitive").product_id == 1
+    assert catalog.by_name("Rich Cream", skin_type="Oily") is None
+    assert catalog.by_name("missing") is None
@@ -0,0 +1,70 @@
+# Tests for the heap-based reminder scheduler
+
+from datetime import datetime, timedelta
+
+from nkahoots.reminders import ReminderScheduler
+
+
+def make_scheduler(tmp_path, fired=None):
+    callback = fired.append if fired is not None else (lambda reminder: None)
+    return ReminderScheduler(None, callback, str(tmp_path / "reminders.json"))
+
+
+def test_cancelled_reminder_is_skipped(tmp_path):
+    fired = []
+    scheduler = make_scheduler(tmp_path, fired)
+    now = datetime(2026, 3, 2, 8, 0)
+    first = scheduler.add("Dry", now - timedelta(minutes=2), repeat=None)
+    second = scheduler.add("Oily", now - timedelta(minutes=1), repeat=None)
+    assert scheduler.cancel(first.reminder_id)
+    assert not scheduler.cancel(first.reminder_id)
+    # The cancelled entry is still in the heap until it reaches the top
+    assert len(scheduler._heap) == 2
+    assert [reminder.reminder_id for reminder in scheduler.fire_due(now)] == [second.reminder_id]
+    assert fired == [second]
+    assert scheduler._heap == []
+    assert len(scheduler) == 0
+
+
+def test_rescheduled_reminder_fires_only_at_its_new_time(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    now = datetime(2026, 3, 2, 8, 0)
+    reminder = scheduler.add("Dry", now - timedelta(minutes=1), repeat=None)
+    scheduler.reschedule(reminder.reminder_id, now + timedelta(hours=1))
+    # The old entry is stale and is dropped without firing
+    assert scheduler.fire_due(now) == []
+    assert len(scheduler._heap) == 1
+    assert scheduler.fire_due(now + timedelta(hours=1)) == [reminder]
+    assert len(scheduler) == 0
+
+
+def test_daily_reminder_rolls_forward_once(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    due = datetime(2026, 3, 2, 8, 0)
+    reminder = scheduler.add("Dry", due)
+    # Three days late: it fires once and moves to the next 08:00 that is still ahead
+    now = due + timedelta(days=3, hours=1)
+    assert scheduler.fire_due(now) == [reminder]
+    assert reminder.due == datetime(2026, 3, 6, 8, 0)
+    assert scheduler.fire_due(now) == []
+    assert scheduler.pending() == [reminder]
+
+
+def test_save_and_load_round_trip(tmp_path):
+    scheduler = make_scheduler(tmp_path)
+    daily = scheduler.add("Dry", datetime(2026, 3, 2, 8, 0))
+    once = scheduler.add("Oily", datetime(2026, 3, 1, 21, 30), repeat=None)
+    cancelled = scheduler.add("Sensitive", datetime(2026, 3, 3, 7, 0))
+    scheduler.cancel(cancelled.reminder_id)
+    scheduler.save()
+
+    restored = make_scheduler(tmp_path)
+    restored.load()
+    assert [(reminder.reminder_id, reminder.skin_type, reminder.due, reminder.repeat) for reminder in restored.pending()] == [
+        (once.reminder_id, "Oily", once.due, None),
+        (daily.reminder_id, "Dry", daily.due, "daily"),
+    ]
+    # Ids are not reused after a restart
+    assert restored.add("Combination", datetime(2026, 3, 4, 9, 0)).reminder_id == cancelled.reminder_id + 1
+    fired = restored.fire_due(datetime(2026, 3, 2, 8, 0))
+    assert [reminder.reminder_id for reminder in fired] == [once.reminder_id, daily.reminder_id]
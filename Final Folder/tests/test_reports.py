@@ -0,0 +1,26 @@
+# Tests for validating the users CSV of the batch reports
+
+import io
+
+from nkahoots.reports import Problems, read_users, valid_reminder_time
+
+
+def test_reminder_time_ranges():
+    for text in ["08:30", "0:00", "23:59", "8:30 PM", "12:00am", "1:05 AM"]:
+        assert valid_reminder_time(text), text
+    for text in ["25:99 PM", "24:00", "08:60", "13:00 PM", "0:30 AM", "8.30", ""]:
+        assert not valid_reminder_time(text), text
+
+
+def test_problems_are_counted_but_only_the_first_kept():
+    problems = Problems(limit=2)
+    problems.extend("row {}".format(number) for number in range(5))
+    assert problems.count == 5
+    assert problems.messages == ["row 0", "row 1"]
+
+
+def test_read_users_skips_invalid_rows():
+    file = io.StringIO("name,skin_type,reminder_time\nAnn,Dry,25:99 PM\nBo,oily,8:30 PM\n,Dry,\nCy,Nope,\n")
+    problems = Problems()
+    assert list(read_users(file, problems)) == [(3, "Bo", "Oily", "8:30 PM")]
+    assert problems.count == 3
@@ -0,0 +1,34 @@
+# Tests for scoring questionnaire CSV files
+
+import io
+
+from nkahoots.scoring import score_csv
+
+
+def run(text, chunk_size=2):
+    output = io.StringIO()
+    errors = []
+    count = score_csv(io.StringIO(text), output, chunk_size, lambda line, message: errors.append(line))
+    return count, output.getvalue().splitlines()[1:], errors
+
+
+def test_quoted_ids_are_kept():
+    count, rows, errors = run('id,tightness,shine,tzone_oiliness,reactivity\n"x,1",5,1,1,2\n')
+    assert (count, errors) == (1, [])
+    assert rows[0].startswith('"x,1",Dry,')
+
+
+def test_invalid_rows_are_reported_and_skipped():
+    text = "id,tightness,shine,tzone_oiliness,reactivity\na,,1,1,1\nb,1,5,4,1\nc,1,2\nd,1,1,1,5\ne,nan,1,1,1\n"
+    count, rows, errors = run(text)
+    assert count == 2
+    assert [row.split(",")[0] for row in rows] == ["b", "d"]
+    assert errors == [2, 4, 6]
+
+
+def test_generated_ids_count_scored_rows_only():
+    text = "tightness,shine,tzone_oiliness,reactivity\n5,1,1,2\n\n1,5,4,1\nx,1,1,1\n\n1,1,1,5\n"
+    count, rows, errors = run(text)
+    assert count == 3
+    assert [row.split(",")[0] for row in rows] == ["1", "2", "3"]
+    assert errors == [5]
@@ -0,0 +1,58 @@
+# Tests for the incremental usage report across log rotations
+
+from datetime import datetime, timedelta
+import os
+
+from nkahoots.event_log import EventLog
+from nkahoots.usage_report import rotated_logs, update
+
+
+def log_launches(log_path, count, start):
+    event_log = EventLog(log_path, flush_policy="event", max_bytes=600)
+    for number in range(count):
+        event_log.log("launch", when=start + timedelta(minutes=number))
+    event_log.close()
+    return start + timedelta(minutes=count)
+
+
+def test_rotation_between_reports_keeps_every_launch(tmp_path):
+    log_path = str(tmp_path / "application_dates.csv")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+
+    next_time = log_launches(log_path, 10, datetime(2026, 3, 2, 8, 0))
+    assert update(log_path, checkpoint_path).launches == 10
+
+    # 40 more launches rotate the 600-byte log at least once, including the file the checkpoint points at
+    log_launches(log_path, 40, next_time)
+    assert rotated_logs(log_path)
+    assert update(log_path, checkpoint_path).launches == 50
+    # A report with nothing new changes nothing
+    assert update(log_path, checkpoint_path).launches == 50
+    assert update(log_path, checkpoint_path, reset=True).launches == 50
+
+
+def test_first_report_reads_rotated_files(tmp_path):
+    log_path = str(tmp_path / "application_dates.csv")
+    log_launches(log_path, 60, datetime(2026, 3, 2, 8, 0))
+    assert len(rotated_logs(log_path)) >= 2
+    stats = update(log_path, str(tmp_path / "checkpoint.json"))
+    assert stats.launches == 60
+    assert stats.gap_count == 59
+
+
+def test_rotated_logs_are_sorted_oldest_first(tmp_path):
+    for name in ["log.2026-03-02.10.csv", "log.2026-03-02.2.csv", "log.2026-03-01.1.csv", "log.csv", "other.2026-03-01.1.csv"]:
+        (tmp_path / name).write_text("")
+    paths = rotated_logs(str(tmp_path / "log.csv"))
+    assert [os.path.basename(path) for path in paths] == [
+        "log.2026-03-01.1.csv", "log.2026-03-02.2.csv", "log.2026-03-02.10.csv"]
+
+
+def test_rows_with_impossible_times_are_skipped(tmp_path):
+    log_path = tmp_path / "application_dates.csv"
+    log_path.write_text("2026-01-01 08:00:00,L\n2026-01-01 99:00:00,L\n2026-01-01 08:61:00,L\n"
+                        "2026-01-01 08:00:75,L\n2026-13-01 08:00:00,L\n2026-01-01 -1:00:00,L\n2026-01-01 09:00:00,L\n")
+    checkpoint_path = str(tmp_path / "checkpoint.json")
+    assert update(str(log_path), checkpoint_path).launches == 2
+    # The checkpoint was saved past the bad rows
+    assert update(str(log_path), checkpoint_path).launches == 2